@@ -0,0 +1,9 @@
+FIELDS_PARAM = 'fields'
+
+IDS_PARAM = 'ids'
+
+LIMIT_PARAM = 'limit'
+
+MAX_IDS = 100
+
+MAX_LIMIT = 100
@@ -0,0 +1,21 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.PostListView.as_view(), name='posts'),
+    path('posts/<int:pk>/', views.PostDetailView.as_view(), name='post'),
+    path(
+        'posts/<int:pk>/comments/',
+        views.CommentListView.as_view(),
+        name='comments'
+    ),
+    path('categories/', views.CategoryListView.as_view(), name='categories'),
+    path(
+        'profiles/<slug:username>/',
+        views.ProfileView.as_view(),
+        name='profile'
+    ),
+]
@@ -0,0 +1,308 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.views import View
+
+from blog.constants import CURSOR_PARAM, PAGINATE_BY
+from blog.models import Comment, Post, User
+from blog.pagination import CursorPaginator, decode_token, encode_token
+from blog.registry import registry
+
+from .constants import FIELDS_PARAM, IDS_PARAM, LIMIT_PARAM, MAX_IDS, MAX_LIMIT
+
+
+class ApiError(Exception):
+    """Ошибка в параметрах запроса: отвечаем 400 с пояснением."""
+
+
+def _category(post):
+    category = registry.category(post.category_id)
+    return category.slug if category is not None else None
+
+
+def _location(post):
+    location = registry.location(post.location_id)
+    if location is None or not location.is_published:
+        return None
+    return location.name
+
+
+def _image(post):
+    return post.image.url if post.image else None
+
+
+# Поле ответа: столбцы для only() и способ получить значение.
+POST_FIELDS = {
+    'id': ((), lambda post: post.pk),
+    'title': (('title',), lambda post: post.title),
+    'text': (('text',), lambda post: post.text),
+    'pub_date': (('pub_date',), lambda post: post.pub_date),
+    'author': (('author__username',), lambda post: post.author.username),
+    'category': (('category_id',), _category),
+    'location': (('location_id',), _location),
+    'image': (('image',), _image),
+    'comment_count': (('comment_count',), lambda post: post.comment_count),
+}
+
+COMMENT_FIELDS = {
+    'id': ((), lambda comment: comment.pk),
+    'text': (('text',), lambda comment: comment.text),
+    'created_at': (('created_at',), lambda comment: comment.created_at),
+    'author': (
+        ('author__username',), lambda comment: comment.author.username
+    ),
+}
+
+PROFILE_FIELDS = {
+    'id': ((), lambda user: user.pk),
+    'username': (('username',), lambda user: user.username),
+    'first_name': (('first_name',), lambda user: user.first_name),
+    'last_name': (('last_name',), lambda user: user.last_name),
+    'date_joined': (('date_joined',), lambda user: user.date_joined),
+}
+
+CATEGORY_FIELDS = {
+    'slug': ((), lambda category: category.slug),
+    'title': ((), lambda category: category.title),
+    'description': ((), lambda category: category.description),
+}
+
+
+def _parse_int(value, name, maximum):
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(f'Параметр {name} должен быть целым числом.')
+    if not 0 < number <= maximum:
+        raise ApiError(f'Параметр {name} должен быть от 1 до {maximum}.')
+    return number
+
+
+class Fieldset:
+    """Набор полей ответа из ``?fields=`` и столбцы, которые он читает."""
+
+    def __init__(self, request, fields, required=()):
+        self.fields = fields
+        raw = request.GET.get(FIELDS_PARAM)
+        if not raw:
+            self.names = list(fields)
+        else:
+            self.names = list(dict.fromkeys(
+                name.strip() for name in raw.split(',') if name.strip()
+            ))
+            unknown = [name for name in self.names if name not in fields]
+            if unknown or not self.names:
+                raise ApiError(
+                    'Неизвестные поля: ' + ', '.join(unknown or [raw])
+                )
+        self.columns = list(dict.fromkeys(
+            [*required] + [
+                column for name in self.names for column in fields[name][0]
+            ]
+        ))
+
+    def apply(self, queryset):
+        """Читает из БД только нужные столбцы и нужные связи."""
+        related = {
+            column.split('__')[0] for column in self.columns
+            if '__' in column
+        }
+        return queryset.select_related(None).select_related(
+            *related
+        ).only(*self.columns)
+
+    def serialize(self, obj):
+        return {name: self.fields[name][1](obj) for name in self.names}
+
+
+class ApiView(View):
+    """Базовое представление API: JSON, ETag и ошибки в теле ответа.
+
+    Обработчики возвращают данные, а ответ с сильным ETag собирается
+    здесь; совпавший If-None-Match получает пустой 304.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            data = super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'detail': str(error)}, status=400)
+        except Http404 as error:
+            return JsonResponse(
+                {'detail': str(error) or 'Не найдено.'}, status=404
+            )
+        if isinstance(data, HttpResponse):
+            return data
+        content = json.dumps(
+            data, cls=DjangoJSONEncoder, ensure_ascii=False,
+            separators=(',', ':')
+        ).encode()
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        response = get_conditional_response(request, etag=etag) or (
+            HttpResponse(content, content_type='application/json')
+        )
+        response['ETag'] = etag
+        return response
+
+    def get_limit(self):
+        limit = self.request.GET.get(LIMIT_PARAM)
+        if limit is None:
+            return PAGINATE_BY
+        return _parse_int(limit, LIMIT_PARAM, MAX_LIMIT)
+
+    def get_ids(self):
+        raw = self.request.GET.get(IDS_PARAM)
+        if raw is None:
+            return None
+        ids = list(dict.fromkeys(
+            _parse_int(value, IDS_PARAM, 2 ** 63 - 1)
+            for value in raw.split(',') if value.strip()
+        ))
+        if not ids or len(ids) > MAX_IDS:
+            raise ApiError(
+                f'В параметре {IDS_PARAM} должно быть от 1 до {MAX_IDS} id.'
+            )
+        return ids
+
+
+class PostListView(ApiView):
+    """Лента публикаций с курсором или пачка публикаций по ``?ids=``.
+
+    Лента видна как на главной; свои записи через ``?author=`` автор
+    видит все, как в профиле. По id отдаётся всё, что пользователь
+    может открыть на странице публикации.
+    """
+
+    query_budget = 5
+
+    def get_queryset(self):
+        user = self.request.user
+        username = self.request.GET.get('author')
+        if username is None:
+            queryset = Post.objects_tailored.all()
+        elif user.is_authenticated and username == user.get_username():
+            queryset = Post.objects.filter(author=user)
+        else:
+            queryset = Post.objects_tailored.filter(
+                author__username=username
+            )
+        slug = self.request.GET.get('category')
+        if slug is not None:
+            category = registry.published_category(slug)
+            if category is None:
+                return queryset.none()
+            queryset = queryset.filter(category_id=category.pk)
+        return queryset
+
+    def get(self, request):
+        # Ключ курсора читается всегда, иначе его дочитает отдельный запрос.
+        fieldset = Fieldset(request, POST_FIELDS, required=('pub_date',))
+        ids = self.get_ids()
+        if ids is not None:
+            posts = fieldset.apply(
+                Post.objects.visible_to(request.user).filter(pk__in=ids)
+            ).in_bulk()
+            return {
+                'results': [
+                    fieldset.serialize(posts[pk]) for pk in ids if pk in posts
+                ]
+            }
+        page = CursorPaginator(
+            fieldset.apply(self.get_queryset()), self.get_limit()
+        ).page(request.GET.get(CURSOR_PARAM))
+        return {
+            'results': [fieldset.serialize(post) for post in page],
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+        }
+
+
+class PostDetailView(ApiView):
+    """Публикация с той же видимостью, что и на её странице."""
+
+    query_budget = 5
+
+    def get(self, request, pk):
+        fieldset = Fieldset(request, POST_FIELDS)
+        post = get_object_or_404(
+            fieldset.apply(Post.objects.visible_to(request.user)), pk=pk
+        )
+        return fieldset.serialize(post)
+
+
+class CommentListView(ApiView):
+    """Комментарии видимой публикации по порядку, с курсором вперёд."""
+
+    query_budget = 5
+
+    def get(self, request, pk):
+        fieldset = Fieldset(request, COMMENT_FIELDS, required=('created_at',))
+        post = get_object_or_404(
+            Post.objects.visible_to(request.user).select_related(None).only(
+                'id'
+            ),
+            pk=pk
+        )
+        comments = fieldset.apply(
+            Comment.objects.filter(post=post)
+        ).order_by('created_at', 'id')
+        token = request.GET.get(CURSOR_PARAM)
+        if token:
+            try:
+                created_at, last_pk = decode_token(token)
+                created_at = parse_datetime(created_at)
+                if created_at is None or not isinstance(last_pk, int):
+                    raise ValueError
+            except (TypeError, ValueError):
+                raise Http404('Некорректный курсор страницы.')
+            comments = comments.filter(
+                Q(created_at__gt=created_at)
+                | Q(created_at=created_at, pk__gt=last_pk)
+            )
+        limit = self.get_limit()
+        rows = list(comments[:limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_token(
+                [rows[-1].created_at.isoformat(), rows[-1].pk]
+            )
+        return {
+            'results': [fieldset.serialize(comment) for comment in rows],
+            'next': next_cursor,
+        }
+
+
+class CategoryListView(ApiView):
+    """Опубликованные категории прямо из реестра в памяти."""
+
+    query_budget = 2
+
+    def get(self, request):
+        fieldset = Fieldset(request, CATEGORY_FIELDS)
+        return {
+            'results': [
+                fieldset.serialize(category)
+                for category in registry.published_categories()
+            ]
+        }
+
+
+class ProfileView(ApiView):
+    """Открытые данные профиля пользователя."""
+
+    query_budget = 1
+
+    def get(self, request, username):
+        fieldset = Fieldset(request, PROFILE_FIELDS)
+        return fieldset.serialize(get_object_or_404(
+            fieldset.apply(User.objects.all()), username=username
+        ))
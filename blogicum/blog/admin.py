@@ -12,6 +12,7 @@ class CategoryAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ['text', 'author', 'is_published']
+    list_select_related = ['author']
     empty_value_display = '-пусто-'
 
 
@@ -23,5 +24,8 @@ class LocationAdmin(admin.ModelAdmin):
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ['title', 'author', 'location', 'category']
+    list_display = [
+        'title', 'author', 'location', 'category', 'comment_count'
+    ]
+    list_select_related = ['author', 'location', 'category']
     empty_value_display = '-пусто-'
@@ -0,0 +1,188 @@
+"""Асинхронные двойники страниц для чтения, подключаемые под ASGI.
+
+Логика и шаблоны те же, что в ``views``; отличие в том, что запросы к БД
+уходят в ограниченный пул ``core.offload``, а независимые — строки ленты
+и её COUNT, публикация и её комментарии — выполняются одновременно.
+"""
+import functools
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+
+from core.offload import gather, offload
+from core.views import AsyncTemplateView
+
+from .caching import page_cache_key, render_post_cards
+from .constants import (COMMENTS_PAGE_PARAM, COMMENTS_PAGINATE_BY,
+                        CURSOR_PARAM, PAGINATE_BY)
+from .forms import CommentForm
+from .models import Comment, Post
+from .pagination import (CachedCountPaginator, CursorPaginator,
+                         KnownCountPaginator)
+from .publication import publication_clock
+from .registry import registry
+from .views import (CategoryFeedMixin, FeedQueryMixin, IndexFeedMixin,
+                    ProfileFeedMixin, store_page)
+
+
+def _page_number(value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+class AsyncPageCacheMixin:
+    """Асинхронный двойник AnonymousPageCacheMixin."""
+
+    cache_key = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        response = await super().dispatch(request, *args, **kwargs)
+        if self.cache_key is not None:
+            patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def prepare(self):
+        super().prepare()
+        publication_clock()
+        if self.request.user.is_authenticated:
+            return None
+        self.cache_key = page_cache_key(self.request)
+        return cache.get(self.cache_key)
+
+    def render(self, context):
+        response = super().render(context)
+        if self.cache_key is not None:
+            store_page(self.request, self.cache_key, response)
+        return response
+
+
+class AsyncFeedMixin(FeedQueryMixin, AsyncPageCacheMixin):
+    """Лента публикаций: строки страницы и COUNT читаются одновременно."""
+
+    paginate_by = PAGINATE_BY
+
+    async def paginate(self, queryset):
+        if self.uses_cursor():
+            page = await offload(
+                CursorPaginator(queryset, self.paginate_by).page,
+                self.request.GET.get(CURSOR_PARAM)
+            )
+            return None, page
+        label, feeds = self.get_feed()
+        paginator = CachedCountPaginator(
+            queryset, self.paginate_by, feed_label=label, feeds=feeds
+        )
+        value = self.request.GET.get('page') or 1
+        if value == 'last':
+            value = await offload(lambda: paginator.num_pages)
+        number = _page_number(value)
+        if number is None:
+            raise Http404('Страница не найдена.')
+        _, rows = await gather(
+            lambda: paginator.count,
+            lambda: list(paginator.page_rows(number))
+        )
+        try:
+            return paginator, paginator.page(number, rows=rows)
+        except InvalidPage:
+            raise Http404('Страница не найдена.')
+
+    async def get_context_data(self, **kwargs):
+        context = await super().get_context_data(**kwargs)
+        paginator, page = await self.paginate(self.get_queryset())
+        context.update(
+            paginator=paginator,
+            page_obj=page,
+            is_paginated=page.has_other_pages(),
+            object_list=page.object_list,
+        )
+        return context
+
+    def render(self, context):
+        render_post_cards(registry.attach(context['page_obj']))
+        return super().render(context)
+
+
+class PostListView(IndexFeedMixin, AsyncFeedMixin, AsyncTemplateView):
+    """Главная страница."""
+
+    query_budget = 6
+    template_name = 'blog/index.html'
+
+
+class CategoryListView(CategoryFeedMixin, AsyncFeedMixin, AsyncTemplateView):
+    """Страница категории."""
+
+    query_budget = 6
+    template_name = 'blog/category.html'
+
+    def prepare(self):
+        # Категория нужна и закешированной странице: иначе 404 не отличить.
+        self.category = self.get_category()
+        return super().prepare()
+
+    async def get_context_data(self, **kwargs):
+        context = await super().get_context_data(**kwargs)
+        context['category'] = self.category
+        return context
+
+
+class PostDetailView(AsyncPageCacheMixin, AsyncTemplateView):
+    """Отдельная страница публикации."""
+
+    query_budget = 4
+    template_name = 'blog/detail.html'
+
+    async def get_context_data(self, **kwargs):
+        context = await super().get_context_data(**kwargs)
+        pk = self.kwargs['pk_post']
+        value = self.request.GET.get(COMMENTS_PAGE_PARAM)
+        number = _page_number(value or 1)
+        calls = [functools.partial(
+            get_object_or_404, Post.objects.visible_to(self.request.user),
+            pk=pk
+        )]
+        if number is not None:
+            # Комментарии читаются вместе с публикацией, не дожидаясь её:
+            # если она не видна, строки просто выбрасываются.
+            bottom = (number - 1) * COMMENTS_PAGINATE_BY
+            calls.append(lambda: list(
+                Comment.objects.filter(post_id=pk).select_related(
+                    'author'
+                )[bottom:bottom + COMMENTS_PAGINATE_BY]
+            ))
+        post, *rows = await gather(*calls)
+        paginator = KnownCountPaginator(
+            post.comments.select_related('author'),
+            COMMENTS_PAGINATE_BY,
+            count=post.comment_count
+        )
+        comments = paginator.get_page(value)
+        if rows and comments.number == number:
+            comments.object_list = rows[0]
+        context.update(
+            object=post, post=post, form=CommentForm(), comments=comments
+        )
+        return context
+
+
+class ProfileListView(ProfileFeedMixin, AsyncFeedMixin, AsyncTemplateView):
+    """Страница пользователя."""
+
+    query_budget = 7
+    template_name = 'blog/profile.html'
+
+    def prepare(self):
+        self.author = self.get_author()
+        return super().prepare()
+
+    async def get_context_data(self, **kwargs):
+        context = await super().get_context_data(**kwargs)
+        context['profile'] = self.author
+        return context
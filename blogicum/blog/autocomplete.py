@@ -0,0 +1,129 @@
+import bisect
+import threading
+
+from django.urls import reverse
+
+from .caching import AUTOCOMPLETE_MARKER, get_versions, touch
+from .constants import AUTOCOMPLETE_LIMIT
+from .models import Category, Location, User
+
+USER = 'user'
+
+CATEGORY = 'category'
+
+LOCATION = 'location'
+
+
+def normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+def _entries_of(kind, obj):
+    """Записи индекса для объекта: по одной на начало каждого слова."""
+    if kind == USER:
+        if not obj.is_active:
+            return []
+        label = obj.username
+        url = reverse('blog:profile', args=[obj.username])
+    elif kind == CATEGORY:
+        if not obj.is_published:
+            return []
+        label = obj.title
+        url = reverse('blog:category_posts', args=[obj.slug])
+    else:
+        if not obj.is_published:
+            return []
+        label, url = obj.name, None
+    words = normalize(label).split(' ')
+    return [
+        (' '.join(words[start:]), kind, obj.pk, label, url)
+        for start in range(len(words))
+    ]
+
+
+class PrefixIndex:
+    """Отсортированный индекс префиксов имён авторов, категорий и мест.
+
+    Подсказки ищутся двоичным поиском в памяти процесса, без запросов к
+    БД. Сигналы правят индекс своего процесса точечно и сдвигают версию
+    в кеше, по которой остальные процессы перечитывают его целиком.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = []
+        self._by_object = {}
+
+    def _current_version(self):
+        return get_versions([AUTOCOMPLETE_MARKER])[AUTOCOMPLETE_MARKER]
+
+    def _ensure_fresh(self):
+        version = self._current_version()
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            by_object = {}
+            sources = (
+                (USER, User.objects.filter(is_active=True)),
+                (CATEGORY, Category.objects.filter(is_published=True)),
+                (LOCATION, Location.objects.filter(is_published=True)),
+            )
+            for kind, queryset in sources:
+                for obj in queryset:
+                    by_object[kind, obj.pk] = _entries_of(kind, obj)
+            self._entries = sorted(
+                entry for entries in by_object.values() for entry in entries
+            )
+            self._by_object = by_object
+            self._version = version
+
+    def update(self, kind, obj, deleted=False):
+        """Точечно заменяет записи объекта после его сохранения.
+
+        Сдвигает версию в кеше, а индекс помечает своей, а не прочитанной:
+        чужая версия новее означает чужие правки, которых в нём нет.
+        """
+        with self._lock:
+            stale = self._version is None or (
+                self._current_version() != self._version
+            )
+            version = touch(AUTOCOMPLETE_MARKER)
+            if stale:
+                # Загрузки не было или другой процесс менял данные после
+                # неё: индекс прочитается целиком при запросе.
+                self._version = None
+                return
+            for entry in self._by_object.pop((kind, obj.pk), []):
+                position = bisect.bisect_left(self._entries, entry)
+                if self._entries[position:position + 1] == [entry]:
+                    del self._entries[position]
+            entries = [] if deleted else _entries_of(kind, obj)
+            for entry in entries:
+                bisect.insort(self._entries, entry)
+            if entries:
+                self._by_object[kind, obj.pk] = entries
+            self._version = version
+
+    def lookup(self, query, limit=AUTOCOMPLETE_LIMIT):
+        """До limit подсказок, где какое-либо слово начинается с query."""
+        self._ensure_fresh()
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        entries = self._entries
+        position = bisect.bisect_left(entries, (prefix,))
+        found, seen = [], set()
+        for key, kind, pk, label, url in entries[position:]:
+            if not key.startswith(prefix) or len(found) == limit:
+                break
+            if (kind, pk) in seen:
+                continue
+            seen.add((kind, pk))
+            found.append({'type': kind, 'label': label, 'url': url})
+        return found
+
+
+autocomplete = PrefixIndex()
@@ -0,0 +1,135 @@
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import Category, Location, Post, User
+
+VERSION_KEY = 'version:{}'
+
+CATEGORIES_FEED = 'categories'
+
+INDEX_FEED = 'index'
+
+PAGES_MARKER = 'pages'
+
+REGISTRY_MARKER = 'registry'
+
+AUTOCOMPLETE_MARKER = 'autocomplete'
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+
+
+def category_feed(category_id):
+    return f'category:{category_id}'
+
+
+def profile_feed(author_id):
+    return f'profile:{author_id}'
+
+
+def object_marker(model, pk):
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def feeds_of_post(post):
+    """Ленты, в которые попадает публикация."""
+    feeds = [INDEX_FEED, profile_feed(post.author_id)]
+    if post.category_id is not None:
+        feeds.append(category_feed(post.category_id))
+    return feeds
+
+
+def is_shared_cache():
+    """Видят ли кеш другие процессы: иначе метки сдвигаются только у себя."""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def get_versions(markers):
+    """Текущие версии меток; отсутствующие создаются заново."""
+    keys = {VERSION_KEY.format(marker) for marker in markers}
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {marker: versions[VERSION_KEY.format(marker)] for marker in markers}
+
+
+def touch(*markers):
+    """Инвалидирует всё, что закешировано от имени указанных меток.
+
+    Возвращает новую версию меток.
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {VERSION_KEY.format(marker): version for marker in set(markers)},
+        None
+    )
+    return version
+
+
+def touch_on_commit(*markers, using=None):
+    """Вызывает touch после фиксации транзакции с изменением.
+
+    Сдвинь метку раньше — параллельный запрос прочитает ещё старые строки
+    и закеширует устаревшую страницу уже под новой версией.
+    """
+    transaction.on_commit(functools.partial(touch, *markers), using=using)
+
+
+def versioned_key(prefix, label, markers):
+    versions = get_versions(markers)
+    return ':'.join(
+        [prefix, label, *(str(versions[marker]) for marker in markers)]
+    )
+
+
+def _post_card_markers(post):
+    return [
+        object_marker(Post, post.pk),
+        object_marker(Category, post.category_id),
+        object_marker(Location, post.location_id),
+        object_marker(User, post.author_id),
+    ]
+
+
+def render_post_cards(posts):
+    """Проставляет публикациям card_html из кеша, дорисовывая промахи."""
+    posts = list(posts)
+    markers = {post.pk: _post_card_markers(post) for post in posts}
+    versions = get_versions(
+        {marker for post_markers in markers.values()
+         for marker in post_markers}
+    )
+    keys = {
+        post.pk: ':'.join([
+            'post-card', str(post.pk), str(post.comment_count),
+            *(str(versions[marker]) for marker in markers[post.pk])
+        ])
+        for post in posts
+    }
+    cards = cache.get_many(keys.values())
+    rendered = {}
+    for post in posts:
+        key = keys[post.pk]
+        if key not in cards:
+            rendered[key] = cards[key] = render_to_string(
+                POST_CARD_TEMPLATE, {'post': post}
+            )
+        post.card_html = mark_safe(cards[key])
+    if rendered:
+        cache.set_many(rendered, settings.POST_CARD_CACHE_TIMEOUT)
+    return posts
+
+
+def page_cache_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return versioned_key('page', path, [PAGES_MARKER])
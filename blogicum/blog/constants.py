@@ -3,3 +3,35 @@ MAX_LENGTH_CHAR = 256
 MAX_LENGTH_SLUG = 64
 
 PAGINATE_BY = 10
+
+COMMENTS_PAGINATE_BY = 50
+
+COMMENTS_PAGE_PARAM = 'comments_page'
+
+CURSOR_PARAM = 'cursor'
+
+CURSOR_NEXT = 'n'
+
+CURSOR_PREVIOUS = 'p'
+
+SEARCH_PARAM = 'q'
+
+SEARCH_MAX_TERMS = 10
+
+AUTOCOMPLETE_LIMIT = 10
+
+AUTOCOMPLETE_MIN_LENGTH = 2
+
+IMAGE_RENDITION_DIR = 'posts_images/renditions'
+
+IMAGE_RENDITION_WIDTHS = (320, 640, 1280)
+
+IMAGE_FALLBACK_WIDTH = 640
+
+IMAGE_PLACEHOLDER_WIDTH = 16
+
+IMAGE_RESIZE_MAX = 2048
+
+CARD_IMAGE_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+FEED_ITEMS = 20
@@ -0,0 +1,75 @@
+import datetime
+import gzip
+import json
+import sys
+from contextlib import contextmanager
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Category, Comment, Location, Post, User
+
+# В порядке зависимостей: при загрузке строка ссылается только на уже
+# записанные строки.
+DUMP_MODELS = (User, Category, Location, Post, Comment)
+
+
+class DumpEncoder(DjangoJSONEncoder):
+    """Как у dumpdata, но время — с микросекундами, без округления."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+@contextmanager
+def open_dump(path, mode):
+    """Файл выгрузки: '-' — стандартный поток, *.gz — со сжатием."""
+    if path == '-':
+        yield sys.stdin if mode == 'r' else sys.stdout
+    elif path.endswith('.gz'):
+        with gzip.open(path, mode + 't', encoding='utf-8') as file:
+            yield file
+    else:
+        with open(path, mode, encoding='utf-8') as file:
+            yield file
+
+
+def dump_lines(model, chunk_size):
+    """Строки модели в формате ``dumpdata --format jsonl``.
+
+    Строки читаются курсором через values_list, без создания объектов и
+    без запросов за связями многие-ко-многим.
+    """
+    names = [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    label = model._meta.label_lower
+    rows = model._default_manager.order_by('pk').values_list(
+        'pk', *names
+    ).iterator(chunk_size=chunk_size)
+    for pk, *values in rows:
+        yield json.dumps(
+            {'model': label, 'pk': pk, 'fields': dict(zip(names, values))},
+            cls=DumpEncoder,
+            ensure_ascii=False
+        ) + '\n'
+
+
+@contextmanager
+def preserved_timestamps(models):
+    """Отключает auto_now/auto_now_add, чтобы даты пришли из выгрузки."""
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    for field, _, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,185 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+
+from .caching import (CATEGORIES_FEED, INDEX_FEED, category_feed,
+                      get_versions, object_marker, profile_feed,
+                      versioned_key)
+from .constants import FEED_ITEMS
+from .models import Post, User
+from .publication import publication_clock
+from .registry import registry
+
+
+def cached_author(username):
+    """Автор по имени из кеша, пока его метка не сдвинута.
+
+    Переименование или удаление сдвигает метку, и тогда автор заново
+    читается из БД.
+    """
+    key = f'feed-author:{username}'
+    cached = cache.get(key)
+    if cached is not None:
+        author, version = cached
+        marker = object_marker(User, author.pk)
+        if get_versions([marker])[marker] == version:
+            return author
+    author = get_object_or_404(User, username=username)
+    marker = object_marker(User, author.pk)
+    cache.set(
+        key, (author, get_versions([marker])[marker]),
+        settings.FEED_CACHE_TIMEOUT
+    )
+    return author
+
+
+class CachedFeed(Feed):
+    """Лента публикаций, закешированная до следующего изменения в ней.
+
+    Готовый XML хранится под ключом из версий меток ленты, а ответ
+    несёт строгий ETag и Last-Modified: опрашивающим агрегаторам чаще
+    всего достаётся пустой 304.
+    """
+
+    query_budget = 3
+
+    def resolve(self, **kwargs):
+        """Объект ленты, её метка и метки, от версий которых она зависит."""
+        raise NotImplementedError
+
+    def get_object(self, request, *args, **kwargs):
+        return request.feed_object
+
+    def __call__(self, request, *args, **kwargs):
+        publication_clock()
+        request.feed_object, label, markers = self.resolve(**kwargs)
+        key = versioned_key(
+            'feed', f'{label}:{self.feed_type.__name__}', markers
+        )
+        cached = cache.get(key)
+        if cached is None:
+            response = super().__call__(request, *args, **kwargs)
+            # Last-Modified — момент сборки документа, а не дата свежей
+            # публикации: правка или удаление тоже должны его сдвигать.
+            cached = (
+                response.content,
+                response['Content-Type'],
+                f'"{hashlib.md5(response.content).hexdigest()}"',
+                int(time.time())
+            )
+            cache.set(key, cached, settings.FEED_CACHE_TIMEOUT)
+        content, content_type, etag, last_modified = cached
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        ) or HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_posts(self, obj):
+        return Post.objects_tailored.select_related('author')
+
+    def items(self, obj):
+        return self.get_posts(obj)[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.username
+
+
+class LatestPostsFeed(CachedFeed):
+    """Все публикации сайта."""
+
+    title = 'Блогикум'
+    description = 'Новые публикации'
+
+    def resolve(self, **kwargs):
+        return None, INDEX_FEED, [INDEX_FEED, CATEGORIES_FEED]
+
+    def link(self):
+        return reverse('blog:index')
+
+
+class CategoryPostsFeed(CachedFeed):
+    """Публикации категории."""
+
+    def resolve(self, category_slug):
+        category = registry.published_category(category_slug)
+        if category is None:
+            raise Http404('Категория не найдена.')
+        feed = category_feed(category.pk)
+        return category, feed, [feed, CATEGORIES_FEED]
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(category=obj)
+
+
+class AuthorPostsFeed(CachedFeed):
+    """Опубликованные записи автора."""
+
+    def resolve(self, username):
+        author = cached_author(username)
+        feed = profile_feed(author.pk)
+        return author, feed, [
+            feed, CATEGORIES_FEED, object_marker(User, author.pk)
+        ]
+
+    def title(self, obj):
+        return f'Блогикум: @{obj.username}'
+
+    def description(self, obj):
+        return f'Публикации автора @{obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(author=obj)
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+class LatestPostsAtomFeed(AtomFeedMixin, LatestPostsFeed):
+    pass
+
+
+class CategoryPostsAtomFeed(AtomFeedMixin, CategoryPostsFeed):
+    pass
+
+
+class AuthorPostsAtomFeed(AtomFeedMixin, AuthorPostsFeed):
+    pass
@@ -0,0 +1,100 @@
+import base64
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .constants import (IMAGE_PLACEHOLDER_WIDTH, IMAGE_RENDITION_DIR,
+                        IMAGE_RENDITION_WIDTHS)
+
+logger = logging.getLogger(__name__)
+
+# Формат Pillow, расширение файла и параметры сохранения.
+RENDITION_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {
+        'quality': 82, 'optimize': True, 'progressive': True
+    }),
+}
+
+
+def _load(image_file):
+    """Картинка в правильной ориентации, без прозрачности и метаданных."""
+    image_file.open('rb')
+    try:
+        with Image.open(image_file) as source:
+            image = ImageOps.exif_transpose(source)
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.getchannel('A'))
+                return background
+            return image.convert('RGB')
+    finally:
+        image_file.close()
+
+
+def rendition_widths(width):
+    """Ширины копий: не больше оригинала, но хотя бы одна."""
+    widths = [size for size in IMAGE_RENDITION_WIDTHS if size < width]
+    if width <= IMAGE_RENDITION_WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def _scaled(image, width):
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def placeholder(image):
+    """Крошечная размытая копия в data URI, пока грузится сама картинка."""
+    buffer = BytesIO()
+    _scaled(image, min(IMAGE_PLACEHOLDER_WIDTH, image.width)).save(
+        buffer, 'JPEG', quality=40
+    )
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f'data:image/jpeg;base64,{encoded}'
+
+
+def build_renditions(image_file):
+    """Создаёт уменьшенные копии изображения и описывает их для шаблонов.
+
+    Ориентация по EXIF применяется к пикселям, а сами EXIF-данные в копии
+    не попадают: Pillow пишет их, только если передать их явно. Размеры и
+    заглушка считаются здесь же, чтобы шаблонам не открывать файл.
+    """
+    meta = {'source': image_file.name, 'renditions': {}}
+    try:
+        image = _load(image_file)
+    except (OSError, Image.DecompressionBombError):
+        logger.warning('Не удалось открыть %s', image_file.name, exc_info=True)
+        return meta
+    meta.update(
+        width=image.width,
+        height=image.height,
+        placeholder=placeholder(image)
+    )
+    storage = image_file.storage
+    stem = posixpath.splitext(posixpath.basename(image_file.name))[0]
+    for width in rendition_widths(image.width):
+        resized = _scaled(image, width)
+        for key, (pillow_format, extension, options) in (
+            RENDITION_FORMATS.items()
+        ):
+            buffer = BytesIO()
+            resized.save(buffer, pillow_format, **options)
+            name = storage.save(
+                f'{IMAGE_RENDITION_DIR}/{stem}-{width}w.{extension}',
+                ContentFile(buffer.getvalue())
+            )
+            meta['renditions'].setdefault(key, []).append([width, name])
+    return meta
+
+
+def delete_renditions(meta, storage):
+    for renditions in meta.get('renditions', {}).values():
+        for _, name in renditions:
+            storage.delete(name)
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.dump import DUMP_MODELS, dump_lines, open_dump
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает пользователей, категории, местоположения, '
+        'публикации и комментарии в JSON Lines.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл выгрузки; *.gz сжимается, «-» — стандартный вывод.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Сколько строк читать из БД за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        # Данные идут в stdout, значит ход работы — в stderr.
+        report = self.stderr if path == '-' else self.stdout
+        started = time.monotonic()
+        total = 0
+        # Одна транзакция — согласованный снимок всех таблиц.
+        with transaction.atomic(), open_dump(path, 'w') as stream:
+            for model in DUMP_MODELS:
+                count = 0
+                for line in dump_lines(model, options['batch_size']):
+                    stream.write(line)
+                    count += 1
+                total += count
+                report.write(f'{model._meta.label_lower}: {count}')
+        rate = total / max(time.monotonic() - started, 1e-9)
+        report.write(self.style.SUCCESS(
+            f'Выгружено {total} объектов, {rate:.0f} в секунду'
+        ))
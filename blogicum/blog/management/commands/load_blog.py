@@ -0,0 +1,108 @@
+import time
+from collections import Counter
+from itertools import groupby, islice
+
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.db import IntegrityError, connection, transaction
+
+from blog.caching import (AUTOCOMPLETE_MARKER, CATEGORIES_FEED, INDEX_FEED,
+                          PAGES_MARKER, REGISTRY_MARKER, object_marker, touch)
+from blog.dump import DUMP_MODELS, open_dump, preserved_timestamps
+from blog.models import Post
+from blog.publication import advance_publication_clock
+from blog.search import index_posts, is_supported
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает выгрузку dump_blog пачками через bulk_create, '
+        'не держа файл в памяти.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл выгрузки; *.gz распаковывается, «-» — стандартный ввод.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько строк вставлять одним INSERT.'
+        )
+        parser.add_argument(
+            '--transaction-size',
+            type=int,
+            default=20000,
+            help='Сколько строк фиксировать одной транзакцией.'
+        )
+
+    def handle(self, *args, **options):
+        counts = Counter()
+        started = time.monotonic()
+        self.search = is_supported()
+        # bulk_create не шлёт сигналов и не вызывает save(): даты, счётчики
+        # и копии изображений приходят из выгрузки, а индекс и кеши
+        # обновляются здесь.
+        with open_dump(options['path'], 'r') as stream, (
+            preserved_timestamps(DUMP_MODELS)
+        ):
+            objects = (
+                item.object for item in serializers.deserialize(
+                    'jsonl', stream, ignorenonexistent=True
+                )
+            )
+            while True:
+                try:
+                    chunk = list(islice(objects, options['transaction_size']))
+                    if not chunk:
+                        break
+                    self._save(chunk, options['batch_size'], counts)
+                except (DeserializationError, IntegrityError) as error:
+                    raise CommandError(
+                        f'Загрузка остановлена после {sum(counts.values())}'
+                        f' объектов: {error.__cause__ or error}'
+                    )
+                total = sum(counts.values())
+                rate = total / max(time.monotonic() - started, 1e-9)
+                self.stdout.write(
+                    f'Загружено {total} объектов, {rate:.0f} в секунду'
+                )
+        self._finish()
+        self.stdout.write(self.style.SUCCESS('Готово: ' + ', '.join(
+            f'{model._meta.label_lower} {counts[model]}'
+            for model in DUMP_MODELS
+        )))
+
+    def _save(self, chunk, batch_size, counts):
+        markers = []
+        with transaction.atomic():
+            for model, run in groupby(chunk, key=type):
+                if model not in DUMP_MODELS:
+                    raise CommandError(
+                        f'Модель {model._meta.label_lower} не входит в '
+                        'выгрузку блога.'
+                    )
+                run = list(run)
+                model._default_manager.bulk_create(run, batch_size=batch_size)
+                if model is Post and self.search:
+                    index_posts(run)
+                counts[model] += len(run)
+                markers += [object_marker(model, obj.pk) for obj in run]
+        touch(*markers)
+
+    def _finish(self):
+        # Ключи задавались явно: счётчики PostgreSQL сдвигаем за них.
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), DUMP_MODELS
+            ):
+                cursor.execute(sql)
+        touch(
+            PAGES_MARKER, INDEX_FEED, CATEGORIES_FEED, REGISTRY_MARKER,
+            AUTOCOMPLETE_MARKER
+        )
+        advance_publication_clock()
@@ -0,0 +1,47 @@
+import math
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.caching import is_shared_cache
+from blog.publication import NEXT_PUBLICATION_KEY, advance_publication_clock
+
+
+class Command(BaseCommand):
+    help = (
+        'Срабатывает в момент каждой отложенной публикации и сбрасывает '
+        'кеши затронутых лент.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Проверить наступившие публикации один раз (для cron).'
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=60,
+            help='Наибольшая пауза между проверками, секунд.'
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            raise CommandError(
+                'Кеш виден только этому процессу: часы сдвинутся у '
+                'планировщика, но не у веб-процессов. Настройте общий '
+                'бэкенд CACHES.'
+            )
+        while True:
+            # Часы переводятся принудительно: так не позже чем через
+            # --max-sleep учитываются и публикации, записанные без сигналов.
+            clock = advance_publication_clock()
+            if options['once']:
+                self.stdout.write(f'Часы публикаций: {clock.isoformat()}')
+                return
+            due = cache.get(NEXT_PUBLICATION_KEY, math.inf)
+            time.sleep(
+                max(0, min(due - time.time(), options['max_sleep']))
+            )
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog.models import Post
+from blog.search import (CREATE_FTS_TABLE, DROP_FTS_TABLE, FTS_TABLE,
+                         index_posts, is_supported)
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает полнотекстовый индекс публикаций пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько публикаций индексировать за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        if not is_supported():
+            raise CommandError(
+                'Полнотекстовый индекс доступен только в SQLite.'
+            )
+        batch_size = options['batch_size']
+        posts = Post.objects.order_by('pk').only('pk', 'title', 'text')
+        total = 0
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(DROP_FTS_TABLE)
+                cursor.execute(CREATE_FTS_TABLE)
+            last_pk = 0
+            while True:
+                batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+                if not batch:
+                    break
+                index_posts(batch)
+                total += len(batch)
+                last_pk = batch[-1].pk
+            with connection.cursor() as cursor:
+                # Сливает сегменты индекса после массовой вставки.
+                cursor.execute(
+                    f'INSERT INTO {FTS_TABLE} ({FTS_TABLE})'
+                    " VALUES ('optimize')"
+                )
+        self.stdout.write(f'Проиндексировано публикаций: {total}')
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Сверяет Post.comment_count с фактическим числом комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, ничего не исправляя.'
+        )
+
+    def handle(self, *args, **options):
+        actual = Coalesce(
+            Subquery(
+                Comment.objects.filter(
+                    post=OuterRef('pk')
+                ).order_by().values('post').annotate(
+                    total=Count('pk')
+                ).values('total')
+            ),
+            0
+        )
+        with transaction.atomic():
+            drifted = Post.objects.annotate(actual=actual).exclude(
+                comment_count=F('actual')
+            )
+            drifted_ids = list(drifted.values_list('pk', flat=True))
+            if drifted_ids and not options['dry_run']:
+                Post.objects.filter(pk__in=drifted_ids).update(
+                    comment_count=actual
+                )
+        self.stdout.write(
+            f'Расхождений найдено: {len(drifted_ids)}'
+            + (' (не исправлены)' if options['dry_run'] else '')
+        )
@@ -0,0 +1,109 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog import rendition_workers
+from blog.caching import PAGES_MARKER, object_marker, touch
+from blog.images import delete_renditions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Заново создаёт уменьшенные копии изображений публикаций '
+        'в нескольких процессах.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Число рабочих процессов (по умолчанию — все ядра).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Сколько публикаций обрабатывать между контрольными точками.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=Path,
+            help=(
+                'Файл контрольной точки: с него работа продолжится после '
+                'прерывания, по завершении он удаляется.'
+            )
+        )
+        parser.add_argument(
+            '--missing',
+            action='store_true',
+            help='Только изображения без копий или без размеров.'
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint']
+        last_pk = 0
+        if checkpoint and checkpoint.exists():
+            last_pk = int(checkpoint.read_text())
+            self.stdout.write(f'Продолжаем после публикации {last_pk}')
+        posts = Post.objects.exclude(image='').filter(
+            pk__gt=last_pk
+        ).order_by('pk').values_list('pk', 'image', 'image_meta').iterator()
+        if options['missing']:
+            posts = (
+                (pk, name, meta) for pk, name, meta in posts
+                if meta.get('source') != name or 'placeholder' not in meta
+            )
+        done = 0
+        started = time.monotonic()
+        # spawn, а не fork: открытое соединение с БД нельзя переносить в
+        # дочерний процесс, а курсор iterator() уже держит его.
+        with ProcessPoolExecutor(
+            options['workers'],
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=rendition_workers.setup,
+            initargs=(str(settings.MEDIA_ROOT),)
+        ) as executor:
+            while True:
+                batch = list(islice(posts, options['batch_size']))
+                if not batch:
+                    break
+                metas = executor.map(
+                    rendition_workers.regenerate,
+                    [name for _, name, _ in batch]
+                )
+                self._save(batch, list(metas))
+                done += len(batch)
+                if checkpoint:
+                    checkpoint.write_text(str(batch[-1][0]))
+                rate = done / max(time.monotonic() - started, 1e-9)
+                self.stdout.write(
+                    f'Обработано {done} изображений, {rate:.1f} в секунду'
+                )
+        if checkpoint and checkpoint.exists():
+            checkpoint.unlink()
+        self.stdout.write(self.style.SUCCESS(f'Готово: {done} изображений'))
+
+    def _save(self, batch, metas):
+        with transaction.atomic():
+            Post.objects.bulk_update(
+                [
+                    Post(pk=pk, image_meta=meta)
+                    for (pk, _, _), meta in zip(batch, metas)
+                ],
+                ['image_meta']
+            )
+        # bulk_update не шлёт сигналов: карточки сбрасываем сами, а старые
+        # копии удаляем, только когда на них уже ничего не ссылается.
+        touch(PAGES_MARKER, *(object_marker(Post, pk) for pk, _, _ in batch))
+        storage = Post._meta.get_field('image').storage
+        for _, _, meta in batch:
+            delete_renditions(meta, storage)
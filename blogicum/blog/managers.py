@@ -1,14 +1,38 @@
 from django.db import models
-from django.utils import timezone
+from django.db.models import Q
+
+RELATED_FIELDS = ('author', 'category', 'location')
+
+
+def published_predicate():
+    from .publication import publication_clock
+
+    return Q(
+        pub_date__lte=publication_clock(),
+        is_published=True,
+        category__is_published=True
+    )
+
+
+class PostQuerySet(models.QuerySet):
+
+    def visible_to(self, user):
+        """Публикации, которые видит пользователь, одним запросом.
+
+        Опубликованное видно всем, а своё автор видит всегда — даже снятое
+        с публикации или отложенное.
+        """
+        visible = published_predicate()
+        if user.is_authenticated:
+            visible |= Q(author=user)
+        return self.filter(visible).select_related(*RELATED_FIELDS)
 
 
 class PostTailorMadeManager(models.Manager):
 
     def get_queryset(self):
         return super().get_queryset().filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True
+            published_predicate()
         ).order_by(
             '-pub_date'
         )
@@ -1,10 +1,11 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 
 from core.models import BaseModel
 
 from .constants import MAX_LENGTH_CHAR, MAX_LENGTH_SLUG
-from .managers import PostTailorMadeManager
+from .managers import PostQuerySet, PostTailorMadeManager
 
 User = get_user_model()
 
@@ -83,18 +84,57 @@ class Post(BaseModel):
         upload_to='posts_images',
         blank=True
     )
+    image_meta = models.JSONField(
+        'Служебные данные изображения',
+        default=dict,
+        blank=True,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         ordering = ['-pub_date']
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
-
-    objects = models.Manager()
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                condition=models.Q(is_published=True),
+                name='post_published_feed_idx'
+            ),
+            models.Index(
+                fields=['category', '-pub_date', '-id'],
+                condition=models.Q(is_published=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx'
+            ),
+        ]
+
+    objects = PostQuerySet.as_manager()
     objects_tailored = PostTailorMadeManager()
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Счётчик комментариев ведут только сами комментарии.
+        if (
+            not self._state.adding and self.pk is not None
+            and kwargs.get('update_fields') is None
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'comment_count'
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(BaseModel):
     """Комментарий к публикации."""
@@ -109,3 +149,27 @@ class Comment(BaseModel):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous_post_id = None
+            if not self._state.adding:
+                previous_post_id = Comment.objects.filter(
+                    pk=self.pk
+                ).values_list('post_id', flat=True).first()
+            super().save(*args, **kwargs)
+            if previous_post_id == self.post_id:
+                return
+            if previous_post_id is not None:
+                Post.objects.filter(
+                    pk=previous_post_id, comment_count__gt=0
+                ).update(comment_count=F('comment_count') - 1)
+            Post.objects.filter(pk=self.post_id).update(
+                comment_count=F('comment_count') + 1
+            )
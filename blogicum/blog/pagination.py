@@ -0,0 +1,201 @@
+import base64
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .caching import versioned_key
+from .constants import CURSOR_NEXT, CURSOR_PREVIOUS
+
+KEYSET_ORDERING = ('-pub_date', '-id')
+
+
+def encode_token(payload):
+    """Непрозрачный URL-безопасный токен из JSON-совместимых значений."""
+    data = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_token(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError):
+        raise Http404('Некорректный курсор страницы.')
+
+
+def encode_cursor(direction, post):
+    """Токен позиции в ленте по ключу (pub_date, id)."""
+    return encode_token([direction, post.pub_date.isoformat(), post.pk])
+
+
+def decode_cursor(token):
+    try:
+        direction, pub_date, pk = decode_token(token)
+        pub_date = parse_datetime(pub_date)
+        if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or (
+            pub_date is None or not isinstance(pk, int)
+        ):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise Http404('Некорректный курсор страницы.')
+    return direction, pub_date, pk
+
+
+class CursorPage(Sequence):
+    """Страница ленты, полученная поиском по ключу вместо OFFSET."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинатор по ключу (pub_date, id): страница N стоит как первая."""
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def page(self, token=None):
+        if not token:
+            return self._forward(self.queryset, has_previous=False)
+        direction, pub_date, pk = decode_cursor(token)
+        if direction == CURSOR_NEXT:
+            return self._forward(
+                self.queryset.filter(
+                    Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+                ),
+                has_previous=True
+            )
+        return self._backward(
+            self.queryset.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            )
+        )
+
+    def _forward(self, queryset, has_previous):
+        rows = list(
+            queryset.order_by(*KEYSET_ORDERING)[:self.per_page + 1]
+        )
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return CursorPage(
+            rows,
+            next_cursor=(
+                encode_cursor(CURSOR_NEXT, rows[-1]) if has_next else None
+            ),
+            previous_cursor=(
+                encode_cursor(CURSOR_PREVIOUS, rows[0])
+                if has_previous and rows else None
+            )
+        )
+
+    def _backward(self, queryset):
+        reversed_ordering = [field.lstrip('-') for field in KEYSET_ORDERING]
+        rows = list(
+            queryset.order_by(*reversed_ordering)[:self.per_page + 1]
+        )
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        return CursorPage(
+            rows,
+            next_cursor=encode_cursor(CURSOR_NEXT, rows[-1]) if rows else None,
+            previous_cursor=(
+                encode_cursor(CURSOR_PREVIOUS, rows[0])
+                if has_previous else None
+            )
+        )
+
+
+def estimate_count(queryset):
+    """Оценка планировщика; None, если СУБД её не даёт."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор с кешируемым (а на больших лентах — оценочным) COUNT."""
+
+    def __init__(self, *args, feed_label, feeds, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.feed_label = feed_label
+        self.feeds = feeds
+        self.is_estimate = False
+
+    @cached_property
+    def count(self):
+        key = versioned_key('feed-count', self.feed_label, self.feeds)
+        cached = cache.get(key)
+        if cached is None:
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and (
+                estimate > settings.FEED_COUNT_ESTIMATE_THRESHOLD
+            ):
+                cached = (estimate, True)
+            else:
+                cached = (self.object_list.count(), False)
+            cache.set(key, cached, settings.FEED_COUNT_CACHE_TIMEOUT)
+        count, self.is_estimate = cached
+        return count
+
+    def page_rows(self, number):
+        """Строки страницы number без COUNT: их можно читать параллельно."""
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom:bottom + self.per_page + self.orphans]
+
+    def page(self, number, rows=None):
+        """Страница number; rows — заранее прочитанные ``page_rows``."""
+        if rows is None:
+            return super().page(number)
+        number = self.validate_number(number)
+        if number * self.per_page + self.orphans < self.count:
+            # Не последняя страница: строки «сирот» ей не достаются.
+            rows = rows[:self.per_page]
+        return self._get_page(rows, number, self)
+
+    def _get_page(self, *args, **kwargs):
+        page = super()._get_page(*args, **kwargs)
+        page.elided_page_range = list(
+            self.get_elided_page_range(page.number)
+        )
+        return page
+
+
+class KnownCountPaginator(Paginator):
+    """Пагинатор, которому число объектов уже известно (без COUNT)."""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
@@ -0,0 +1,76 @@
+import math
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from .caching import (CATEGORIES_FEED, INDEX_FEED, PAGES_MARKER,
+                      feeds_of_post, touch)
+
+CLOCK_KEY = 'publication:clock'
+
+NEXT_PUBLICATION_KEY = 'publication:next'
+
+
+def _next_publication(after):
+    from .models import Post
+
+    moment = Post.objects.filter(pub_date__gt=after).aggregate(
+        moment=Min('pub_date')
+    )['moment']
+    return moment.timestamp() if moment else math.inf
+
+
+def _tick(force):
+    from .models import Post
+
+    now = timezone.now()
+    clock = cache.get(CLOCK_KEY)
+    due = cache.get(NEXT_PUBLICATION_KEY)
+    if not force and clock is not None and (
+        due is not None and due > now.timestamp()
+    ):
+        return clock
+    if clock is None:
+        # Неизвестно, что публиковалось без нас: сбрасываем все ленты.
+        touch(PAGES_MARKER, INDEX_FEED, CATEGORIES_FEED)
+    else:
+        published = Post.objects.filter(
+            pub_date__gt=clock, pub_date__lte=now
+        ).only('author_id', 'category_id')
+        feeds = {feed for post in published for feed in feeds_of_post(post)}
+        if feeds:
+            touch(PAGES_MARKER, *feeds)
+    cache.set_many(
+        {CLOCK_KEY: now, NEXT_PUBLICATION_KEY: _next_publication(now)}, None
+    )
+    return now
+
+
+def publication_clock():
+    """Момент, на который считается видимость публикаций.
+
+    Часы стоят, пока не наступит дата ближайшей отложенной публикации:
+    тогда сбрасываются кеши ровно тех лент, куда она попадает. Поэтому
+    условие видимости в запросах не меняется от запроса к запросу.
+
+    Часы двигают сигналы Post и команда publication_scheduler. Запись в
+    обход сигналов (update(), bulk_create, сырой SQL) должна сама вызвать
+    advance_publication_clock(), а если дата уже прошла — и сдвинуть
+    метки затронутых лент, как это делает load_blog.
+    """
+    return _tick(force=False)
+
+
+def advance_publication_clock():
+    """Переводит часы на текущий момент, например после сохранения поста."""
+    return _tick(force=True)
+
+
+def schedule_publication(post):
+    """Учитывает отложенную публикацию в дате ближайшего срабатывания."""
+    moment = post.pub_date.timestamp()
+    due = cache.get(NEXT_PUBLICATION_KEY)
+    # Без известной даты часы сами найдут ближайшую публикацию в БД.
+    if due is not None and moment < due:
+        cache.set(NEXT_PUBLICATION_KEY, moment, None)
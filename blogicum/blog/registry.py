@@ -0,0 +1,78 @@
+import threading
+
+from .caching import REGISTRY_MARKER, get_versions
+from .models import Category, Location
+
+
+class Registry:
+    """Категории и местоположения в памяти процесса.
+
+    Таблицы крошечные и меняются редко, поэтому загружаются целиком и
+    перечитываются, только когда сигналы сдвинули версию реестра в кеше.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._categories = {}
+        self._categories_by_slug = {}
+        self._locations = {}
+
+    def _ensure_fresh(self):
+        version = get_versions([REGISTRY_MARKER])[REGISTRY_MARKER]
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            categories = list(Category.objects.all())
+            self._categories = {
+                category.pk: category for category in categories
+            }
+            self._categories_by_slug = {
+                category.slug: category for category in categories
+            }
+            self._locations = {
+                location.pk: location for location in Location.objects.all()
+            }
+            self._version = version
+
+    def published_category(self, slug):
+        self._ensure_fresh()
+        category = self._categories_by_slug.get(slug)
+        if category is None or not category.is_published:
+            return None
+        return category
+
+    def published_categories(self):
+        self._ensure_fresh()
+        return sorted(
+            (category for category in self._categories.values()
+             if category.is_published),
+            key=lambda category: category.title
+        )
+
+    def category(self, pk):
+        self._ensure_fresh()
+        return self._categories.get(pk)
+
+    def location(self, pk):
+        self._ensure_fresh()
+        return self._locations.get(pk)
+
+    def attach(self, posts):
+        """Подставляет публикациям категории и местоположения из реестра."""
+        self._ensure_fresh()
+        for post in posts:
+            if post.category_id is not None:
+                category = self._categories.get(post.category_id)
+                if category is not None:
+                    post.category = category
+            if post.location_id is not None:
+                location = self._locations.get(post.location_id)
+                if location is not None:
+                    post.location = location
+        return posts
+
+
+registry = Registry()
@@ -0,0 +1,21 @@
+"""Рабочие процессы regenerate_renditions.
+
+Модуль импортируется в процессе, запущенном через spawn, до настройки
+Django, поэтому модели подключаются только внутри функций.
+"""
+import django
+from django.conf import settings
+
+
+def setup(media_root):
+    django.setup()
+    # Файлы кладутся туда же, откуда их читает родительский процесс.
+    settings.MEDIA_ROOT = media_root
+
+
+def regenerate(name):
+    # В рабочем процессе только файлы: БД обновляет родительский процесс.
+    from .images import build_renditions
+    from .models import Post
+
+    return build_renditions(Post(image=name).image)
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+from .constants import IMAGE_RESIZE_MAX
+
+SIGNER = signing.Signer(salt='blog.resize')
+
+# Формат Pillow и тип содержимого по расширению исходного файла.
+OUTPUT_FORMATS = {
+    '.png': ('PNG', 'image/png', {'optimize': True}),
+    '.webp': ('WEBP', 'image/webp', {'quality': 80}),
+    '.jpg': ('JPEG', 'image/jpeg', {'quality': 82, 'progressive': True}),
+}
+
+_locks = {}
+
+_locks_guard = threading.Lock()
+
+
+def _variant(width, height, name):
+    return f'{width}x{height}/{name}'
+
+
+def signature(width, height, name):
+    return SIGNER.signature(_variant(width, height, name))
+
+
+def is_valid_signature(width, height, name, value):
+    return signing.constant_time_compare(
+        signature(width, height, name), value or ''
+    )
+
+
+def resized_url(image, width, height):
+    """Подписанный адрес копии, вписанной в width x height."""
+    return reverse(
+        'blog:resize_image', args=[width, height, image.name]
+    ) + f'?s={signature(width, height, image.name)}'
+
+
+def output_format(name):
+    extension = os.path.splitext(name)[1].lower()
+    return OUTPUT_FORMATS.get(extension, OUTPUT_FORMATS['.jpg'])
+
+
+@contextmanager
+def _coalesced(key):
+    """Один поток на вариант: остальные ждут его результата."""
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        yield
+    with _locks_guard:
+        if not lock.locked():
+            _locks.pop(key, None)
+
+
+def _resize(source, target, width, height):
+    pillow_format, _, options = output_format(source)
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if pillow_format == 'JPEG':
+            image = image.convert('RGB')
+        image.thumbnail(
+            (min(width, IMAGE_RESIZE_MAX), min(height, IMAGE_RESIZE_MAX)),
+            Image.Resampling.LANCZOS
+        )
+        # Пишем во временный файл рядом: другие процессы не увидят
+        # недописанную копию.
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(target))
+        try:
+            with os.fdopen(handle, 'wb') as output:
+                image.save(output, pillow_format, **options)
+            os.replace(temporary, target)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def _evict(root, limit):
+    """Удаляет давно не запрошенные копии, пока кеш не влезет в лимит."""
+    entries = []
+    total = 0
+    with os.scandir(root) as scan:
+        for entry in scan:
+            if entry.is_file() and not entry.name.startswith('tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+    if total <= limit:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        total -= size
+        if total <= limit * 0.9:
+            break
+
+
+def cached_variant(source, width, height):
+    """Путь к копии в дисковом LRU-кеше, создаёт её при первом запросе.
+
+    Время изменения файла в кеше служит отметкой последнего обращения.
+    Параллельные запросы одной копии в процессе ждут единственную
+    обработку.
+    """
+    mtime = os.stat(source).st_mtime_ns
+    key = hashlib.sha256(
+        f'{source}:{mtime}:{width}x{height}'.encode()
+    ).hexdigest()
+    root = settings.RESIZE_CACHE_ROOT
+    target = os.path.join(root, key + os.path.splitext(source)[1].lower())
+    if os.path.exists(target):
+        os.utime(target)
+        return target
+    with _coalesced(key):
+        if os.path.exists(target):
+            return target
+        os.makedirs(root, exist_ok=True)
+        _resize(source, target, width, height)
+    _evict(root, settings.RESIZE_CACHE_MAX_BYTES)
+    return target
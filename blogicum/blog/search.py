@@ -0,0 +1,117 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+
+from .constants import SEARCH_MAX_TERMS
+from .pagination import (CursorPage, CursorPaginator, decode_token,
+                         encode_token)
+
+FTS_TABLE = 'blog_post_fts'
+
+CREATE_FTS_TABLE = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+    "title, text, tokenize='unicode61 remove_diacritics 2')"
+)
+
+DROP_FTS_TABLE = f'DROP TABLE IF EXISTS {FTS_TABLE}'
+
+TERM = re.compile(r'\w+')
+
+
+def is_supported(using='default'):
+    """Полнотекстовый индекс есть только в SQLite (FTS5)."""
+    return connections[using].vendor == 'sqlite'
+
+
+def index_posts(posts, using='default'):
+    """Заменяет записи индекса для переданных публикаций."""
+    rows = [(post.pk, post.title, post.text) for post in posts]
+    if not rows or not is_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(pk,) for pk, _, _ in rows]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text)'
+            ' VALUES (%s, %s, %s)',
+            rows
+        )
+
+
+def unindex_post(pk, using='default'):
+    if not is_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def match_expression(query):
+    """Запрос FTS5 из слов поиска; синтаксис FTS5 пользователю не доступен.
+
+    Каждое слово берётся в кавычки, последнее ищется как префикс.
+    """
+    terms = TERM.findall(query)[:SEARCH_MAX_TERMS]
+    if not terms:
+        return ''
+    return ' '.join(f'"{term}"' for term in terms) + '*'
+
+
+class SearchPaginator:
+    """Результаты поиска по ключу (bm25, id), лучшие совпадения первыми."""
+
+    def __init__(self, queryset, per_page, query):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.query = query
+
+    def page(self, token=None):
+        expression = match_expression(self.query)
+        if not expression:
+            return CursorPage([])
+        if not is_supported(self.queryset.db):
+            return self._fallback(token)
+        # bm25() доступна только в запросе к самой FTS-таблице, поэтому
+        # она присоединяется через extra(), а не через ORM-связь.
+        where = [f'{FTS_TABLE}.rowid = blog_post.id', f'{FTS_TABLE} MATCH %s']
+        params = [expression]
+        if token:
+            where.append(f'(bm25({FTS_TABLE}), blog_post.id) > (%s, %s)')
+            params.extend(self._decode(token))
+        rows = list(
+            self.queryset.extra(
+                select={'rank': f'bm25({FTS_TABLE})'},
+                tables=[FTS_TABLE],
+                where=where,
+                params=params
+            ).order_by('rank', 'id')[:self.per_page + 1]
+        )
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return CursorPage(
+            rows,
+            next_cursor=(
+                encode_token([rows[-1].rank, rows[-1].pk])
+                if has_next else None
+            )
+        )
+
+    def _decode(self, token):
+        values = decode_token(token)
+        if not isinstance(values, list) or len(values) != 2 or not (
+            isinstance(values[0], (int, float)) and isinstance(values[1], int)
+        ):
+            raise Http404('Некорректный курсор страницы.')
+        return values
+
+    def _fallback(self, token):
+        # Без FTS5 — полный просмотр, лента в обычном порядке по дате.
+        condition = Q()
+        for term in TERM.findall(self.query)[:SEARCH_MAX_TERMS]:
+            condition &= Q(title__icontains=term) | Q(text__icontains=term)
+        return CursorPaginator(
+            self.queryset.filter(condition), self.per_page
+        ).page(token)
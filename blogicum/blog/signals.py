@@ -0,0 +1,171 @@
+import functools
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .autocomplete import CATEGORY, LOCATION, USER, autocomplete
+from .caching import (CATEGORIES_FEED, PAGES_MARKER, REGISTRY_MARKER,
+                      category_feed, feeds_of_post, object_marker,
+                      touch_on_commit)
+from .images import build_renditions, delete_renditions
+from .models import Category, Comment, Location, Post, User
+from .publication import advance_publication_clock, schedule_publication
+from .search import index_posts, unindex_post
+
+# Поля пользователя, которые видны в карточках и на странице профиля.
+PAGE_USER_FIELDS = ('username', 'first_name', 'last_name', 'is_staff')
+
+# Поля пользователя, от которых зависят подсказки поиска.
+AUTOCOMPLETE_USER_FIELDS = ('username', 'is_active')
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).update(comment_count=F('comment_count') - 1)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_feeds(sender, instance, raw=False, **kwargs):
+    instance._previous_feeds = []
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    previous = Post.objects.filter(pk=instance.pk).only(
+        'author_id', 'category_id'
+    ).first()
+    if previous is not None:
+        instance._previous_feeds = feeds_of_post(previous)
+
+
+@receiver(post_save, sender=Post)
+def update_image_renditions(sender, instance, raw=False, **kwargs):
+    # Подключается раньше сброса кешей: карточка перерисуется уже с копиями.
+    source = instance.image.name or None
+    if raw or instance.image_meta.get('source') == source:
+        return
+    if instance.image_meta:
+        delete_renditions(instance.image_meta, instance.image.storage)
+    instance.image_meta = build_renditions(instance.image) if source else {}
+    Post.objects.filter(pk=instance.pk).update(
+        image_meta=instance.image_meta
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def touch_post_feeds(sender, instance, using, **kwargs):
+    touch_on_commit(
+        PAGES_MARKER,
+        object_marker(Post, instance.pk),
+        *feeds_of_post(instance),
+        *getattr(instance, '_previous_feeds', []),
+        using=using
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_publication_clock(sender, instance, using, **kwargs):
+    if instance.pub_date > timezone.now():
+        transaction.on_commit(
+            functools.partial(schedule_publication, instance), using=using
+        )
+    else:
+        transaction.on_commit(advance_publication_clock, using=using)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, using, **kwargs):
+    index_posts([instance], using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_index(sender, instance, using, **kwargs):
+    unindex_post(instance.pk, using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def touch_category_feeds(sender, instance, using, **kwargs):
+    touch_on_commit(
+        PAGES_MARKER,
+        REGISTRY_MARKER,
+        object_marker(Category, instance.pk),
+        CATEGORIES_FEED,
+        category_feed(instance.pk),
+        using=using
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def touch_location(sender, instance, using, **kwargs):
+    touch_on_commit(
+        PAGES_MARKER, REGISTRY_MARKER, object_marker(Location, instance.pk),
+        using=using
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_user_changes(sender, instance, raw=False, update_fields=None,
+                          **kwargs):
+    """Запоминает, какие из показываемых на сайте полей меняет сохранение.
+
+    Вход сохраняет только last_login: такое сохранение ничего не сбрасывает
+    и не стоит лишнего запроса.
+    """
+    watched = {*PAGE_USER_FIELDS, *AUTOCOMPLETE_USER_FIELDS}
+    if update_fields is not None:
+        watched &= set(update_fields)
+    instance._changed_fields = watched
+    if raw or instance._state.adding or instance.pk is None or not watched:
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*watched).first()
+    if previous is not None:
+        instance._changed_fields = {
+            name for name in watched
+            if previous[name] != getattr(instance, name)
+        }
+
+
+def user_changed(instance, fields, signal):
+    if signal is post_delete:
+        return True
+    changed = getattr(instance, '_changed_fields', None)
+    return changed is None or not changed.isdisjoint(fields)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def touch_object(sender, instance, signal, using, **kwargs):
+    if user_changed(instance, PAGE_USER_FIELDS, signal):
+        touch_on_commit(
+            PAGES_MARKER, object_marker(sender, instance.pk), using=using
+        )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_comment_pages(sender, instance, using, **kwargs):
+    touch_on_commit(PAGES_MARKER, using=using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def update_autocomplete(sender, instance, signal, using, **kwargs):
+    if sender is User and not user_changed(
+        instance, AUTOCOMPLETE_USER_FIELDS, signal
+    ):
+        return
+    kind = {User: USER, Category: CATEGORY, Location: LOCATION}[sender]
+
+    transaction.on_commit(functools.partial(
+        autocomplete.update, kind, instance, deleted=signal is post_delete
+    ), using=using)
@@ -0,0 +1,40 @@
+from django import template
+
+from ..constants import CARD_IMAGE_SIZES, IMAGE_FALLBACK_WIDTH
+from ..resize import resized_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def resized(image, width, height):
+    """Адрес копии, вписанной в width x height и созданной по запросу."""
+    return resized_url(image, width, height)
+
+
+@register.inclusion_tag('includes/responsive_image.html')
+def responsive_image(image, meta, sizes=CARD_IMAGE_SIZES):
+    """Изображение с уменьшенными копиями в srcset вместо оригинала."""
+    if meta.get('source') != image.name:
+        meta = {}
+    renditions = meta.get('renditions', {})
+
+    def srcset(key):
+        return ', '.join(
+            f'{image.storage.url(name)} {width}w'
+            for width, name in renditions.get(key, [])
+        )
+
+    jpeg = renditions.get('jpeg', [])
+    fitting = [name for width, name in jpeg if width <= IMAGE_FALLBACK_WIDTH]
+    fallback = (fitting or [name for _, name in jpeg])[-1:]
+    return {
+        'original': image.url,
+        'src': image.storage.url(fallback[0]) if fallback else image.url,
+        'jpeg_srcset': srcset('jpeg'),
+        'webp_srcset': srcset('webp'),
+        'sizes': sizes,
+        'width': meta.get('width'),
+        'height': meta.get('height'),
+        'placeholder': meta.get('placeholder'),
+    }
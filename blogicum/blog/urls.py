@@ -1,19 +1,45 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, feeds, views
 
 app_name = 'blog'
 
+# Под ASGI страницы для чтения отдаются асинхронными двойниками.
+read_views = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns = [
-    path('', views.PostListView.as_view(), name='index'),
+    path('', read_views.PostListView.as_view(), name='index'),
+    path('rss/', feeds.LatestPostsFeed(), name='index_rss'),
+    path('atom/', feeds.LatestPostsAtomFeed(), name='index_atom'),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.CategoryPostsFeed(),
+        name='category_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.CategoryPostsAtomFeed(),
+        name='category_atom'
+    ),
+    path(
+        'autocomplete/',
+        views.AutocompleteView.as_view(),
+        name='autocomplete'
+    ),
     path(
         'category/<slug:category_slug>/',
-        views.CategoryListView.as_view(),
+        read_views.CategoryListView.as_view(),
         name='category_posts'
     ),
+    path(
+        'media/resize/<int:width>x<int:height>/<path:path>',
+        views.ResizeImageView.as_view(),
+        name='resize_image'
+    ),
     path(
         'posts/<int:pk_post>/',
-        views.PostDetailView.as_view(),
+        read_views.PostDetailView.as_view(),
         name='post_detail'
     ),
     path(
@@ -46,6 +72,11 @@ urlpatterns = [
         views.PostCreateView.as_view(),
         name='create_post'
     ),
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
     path(
         'profile/edit/',
         views.ProfileUpdateView.as_view(),
@@ -53,7 +84,17 @@ urlpatterns = [
     ),
     path(
         'profile/<slug:username>/',
-        views.ProfileListView.as_view(),
+        read_views.ProfileListView.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<slug:username>/rss/',
+        feeds.AuthorPostsFeed(),
+        name='profile_rss'
+    ),
+    path(
+        'profile/<slug:username>/atom/',
+        feeds.AuthorPostsAtomFeed(),
+        name='profile_atom'
+    ),
 ]
@@ -1,99 +1,320 @@
+import os
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import Http404, JsonResponse
 from django.http.response import HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
+from django.utils.cache import patch_vary_headers
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
-
-from .constants import PAGINATE_BY
-from .forms import CommentForm, PostForm, UserForm
-from .models import Category, Comment, Post, User
+                                  UpdateView, View)
+from PIL import Image
 
+from core.media import serve_file
 
-def make_comment_annotation(db_manager):
-    # =========================================================================
-    # TODO: Rewrite to Pipe Instead
-    # =========================================================================
-    return db_manager.annotate(comment_count=Count('comments'))
+from .autocomplete import autocomplete
+from .caching import (CATEGORIES_FEED, INDEX_FEED, category_feed,
+                      page_cache_key, profile_feed, render_post_cards)
+from .constants import (AUTOCOMPLETE_MIN_LENGTH, COMMENTS_PAGE_PARAM,
+                        COMMENTS_PAGINATE_BY, CURSOR_PARAM, IMAGE_RESIZE_MAX,
+                        PAGINATE_BY, SEARCH_PARAM)
+from .forms import CommentForm, PostForm, UserForm
+from .managers import RELATED_FIELDS
+from .models import Comment, Post, User
+from .pagination import (CachedCountPaginator, CursorPaginator,
+                         KnownCountPaginator)
+from .publication import publication_clock
+from .registry import registry
+from .resize import cached_variant, is_valid_signature, output_format
+from .search import SearchPaginator
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
 
+    def get_object(self, queryset=None):
+        # Проверка прав и сам UpdateView/DeleteView делят один запрос.
+        if not hasattr(self, '_object'):
+            self._object = super().get_object(queryset)
+        return self._object
+
     def test_func(self):
         object = self.get_object()
-        return object.author == self.request.user
+        return object.author_id == self.request.user.pk
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         return redirect('blog:post_detail', self.kwargs['pk_post'])
 
 
-class PostListView(ListView):
+class VisiblePostMixin:
+    """Публикация из URL с учётом её видимости для пользователя."""
+
+    def get_visible_post(self):
+        return get_object_or_404(
+            Post.objects.visible_to(self.request.user),
+            pk=self.kwargs['pk_post']
+        )
+
+
+def store_page(request, key, response):
+    """Кладёт готовую страницу анонимного посетителя в кеш."""
+    # Страницы с CSRF-токеном или выставленными cookie не кешируются:
+    # иначе чужой токен достанется другим посетителям.
+    if response.status_code != 200 or response.cookies or (
+        request.META.get('CSRF_COOKIE_USED')
+    ):
+        return
+    cache.set(key, response, settings.ANONYMOUS_PAGE_CACHE_TIMEOUT)
+
+
+class AnonymousPageCacheMixin:
+    """Целиком кеширует страницу для анонимных посетителей."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or (
+            request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        publication_clock()
+        key = page_cache_key(request)
+        response = cache.get(key)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'add_post_render_callback'):
+                response.add_post_render_callback(
+                    lambda rendered: store_page(request, key, rendered)
+                )
+            else:
+                store_page(request, key, response)
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+
+class FeedQueryMixin:
+    """Выборка и версии ленты, общие для синхронных и async-страниц."""
+
+    def get_feed(self):
+        """Метка ленты и ленты, от версий которых зависит её содержимое."""
+        raise NotImplementedError
+
+    def uses_cursor(self):
+        return settings.POSTS_CURSOR_PAGINATION or (
+            CURSOR_PARAM in self.request.GET
+        )
+
+
+class IndexFeedMixin(FeedQueryMixin):
+    """Лента главной страницы."""
+
+    def get_queryset(self):
+        return Post.objects_tailored.select_related('author')
+
+    def get_feed(self):
+        return INDEX_FEED, [INDEX_FEED, CATEGORIES_FEED]
+
+
+class CategoryFeedMixin(FeedQueryMixin):
+    """Лента категории; ``self.category`` задаёт представление."""
+
+    def get_category(self):
+        category = registry.published_category(self.kwargs['category_slug'])
+        if category is None:
+            raise Http404('Категория не найдена.')
+        return category
+
+    def get_queryset(self):
+        return Post.objects_tailored.select_related('author').filter(
+            category=self.category
+        )
+
+    def get_feed(self):
+        feed = category_feed(self.category.pk)
+        return feed, [feed, CATEGORIES_FEED]
+
+
+class ProfileFeedMixin(FeedQueryMixin):
+    """Лента пользователя; ``self.author`` задаёт представление."""
+
+    def get_author(self):
+        return get_object_or_404(User, username=self.kwargs['username'])
+
+    def is_own(self):
+        return self.author == self.request.user
+
+    def get_queryset(self):
+        db_manager = Post.objects.all() if (
+            self.is_own()
+        ) else Post.objects_tailored.all()
+        return db_manager.select_related(*RELATED_FIELDS).filter(
+            author=self.author
+        ).order_by(
+            '-pub_date'
+        )
+
+    def get_feed(self):
+        feed = profile_feed(self.author.pk)
+        visibility = 'own' if self.is_own() else 'public'
+        return f'{feed}:{visibility}', [feed, CATEGORIES_FEED]
+
+
+class FeedPaginationMixin(FeedQueryMixin):
+    """Пагинация ленты: OFFSET с кешируемым COUNT или поиск по ключу."""
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        label, feeds = self.get_feed()
+        return CachedCountPaginator(
+            queryset, per_page, feed_label=label, feeds=feeds, **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor():
+            return super().paginate_queryset(queryset, page_size)
+        page = CursorPaginator(queryset, page_size).page(
+            self.request.GET.get(CURSOR_PARAM)
+        )
+        return (None, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        render_post_cards(registry.attach(context['page_obj']))
+        return context
+
+
+class PostListView(
+    AnonymousPageCacheMixin, IndexFeedMixin, FeedPaginationMixin, ListView
+):
     """Главная страница."""
 
     model = Post
+    query_budget = 6
     paginate_by = PAGINATE_BY
-    queryset = make_comment_annotation(Post.objects_tailored.all())
     template_name = 'blog/index.html'
 
 
-class CategoryListView(ListView):
+class CategoryListView(
+    AnonymousPageCacheMixin, CategoryFeedMixin, FeedPaginationMixin, ListView
+):
     """Страница категории."""
 
     model = Post
+    query_budget = 6
     paginate_by = PAGINATE_BY
     template_name = 'blog/category.html'
 
     def get_queryset(self):
-        category = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
-        return make_comment_annotation(
-            Post.objects_tailored.filter(category=category)
-        )
+        self.category = self.get_category()
+        return super().get_queryset()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
+        context['category'] = self.category
         return context
 
 
-class PostDetailView(DetailView):
+class PostDetailView(AnonymousPageCacheMixin, DetailView):
     """Отдельная страница публикации."""
 
     model = Post
+    query_budget = 4
     pk_url_kwarg = 'pk_post'
     template_name = 'blog/detail.html'
 
+    def get_queryset(self):
+        return Post.objects.visible_to(self.request.user)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
+        paginator = KnownCountPaginator(
+            self.object.comments.select_related('author'),
+            COMMENTS_PAGINATE_BY,
+            count=self.object.comment_count
+        )
+        context['comments'] = paginator.get_page(
+            self.request.GET.get(COMMENTS_PAGE_PARAM)
+        )
+        return context
 
-        post_particular = get_object_or_404(Post, pk=self.kwargs['pk_post'])
-        db_manager = Post.objects.all() if (
-            post_particular.author == self.request.user
-        ) else Post.objects_tailored.all()
 
-        context['post'] = get_object_or_404(
-            db_manager,
-            pk=self.kwargs['pk_post']
-        )
-        context['comments'] = self.object.comments.all().select_related('post')
+class SearchView(AnonymousPageCacheMixin, ListView):
+    """Полнотекстовый поиск по публикациям."""
+
+    model = Post
+    query_budget = 6
+    paginate_by = PAGINATE_BY
+    template_name = 'blog/search.html'
+
+    def get_queryset(self):
+        return Post.objects_tailored.select_related('author')
+
+    def paginate_queryset(self, queryset, page_size):
+        page = SearchPaginator(
+            queryset, page_size, self.request.GET.get(SEARCH_PARAM, '')
+        ).page(self.request.GET.get(CURSOR_PARAM))
+        return (None, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get(SEARCH_PARAM, '')
+        render_post_cards(registry.attach(context['page_obj']))
         return context
 
 
+class AutocompleteView(View):
+    """Подсказки авторов, категорий и мест по началу слова."""
+
+    # Отвечает из индекса в памяти; request.user не трогаем, чтобы не
+    # читать сессию из БД на каждое нажатие клавиши. Запросы к БД нужны
+    # только для загрузки индекса, по одному на источник.
+    query_budget = 3
+
+    def get(self, request):
+        query = request.GET.get(SEARCH_PARAM, '').strip()
+        results = autocomplete.lookup(query) if (
+            len(query) >= AUTOCOMPLETE_MIN_LENGTH
+        ) else []
+        return JsonResponse({'results': results})
+
+
+class ResizeImageView(View):
+    """Копия изображения произвольного размера по подписанной ссылке."""
+
+    query_budget = 0
+
+    def get(self, request, width, height, path):
+        if not (
+            0 < width <= IMAGE_RESIZE_MAX and 0 < height <= IMAGE_RESIZE_MAX
+        ) or not is_valid_signature(width, height, path, request.GET.get('s')):
+            raise Http404('Неизвестная копия изображения.')
+        try:
+            source = default_storage.path(path)
+        except SuspiciousFileOperation:
+            raise Http404('Неизвестная копия изображения.')
+        if not os.path.isfile(source):
+            raise Http404('Изображение не найдено.')
+        try:
+            variant = cached_variant(source, width, height)
+        except (OSError, Image.DecompressionBombError):
+            raise Http404('Изображение не удалось обработать.')
+        return serve_file(
+            request,
+            variant,
+            content_type=output_format(path)[1],
+            max_age=settings.RESIZE_CACHE_CONTROL_MAX_AGE
+        )
+
+
 # =============================================================================
 # Comment Model CRUD Classes:
 # =============================================================================
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(
+    LoginRequiredMixin, VisiblePostMixin, CreateView
+):
     """Представление для создания комментария."""
 
     model = Comment
@@ -103,10 +324,7 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(
-            Post,
-            pk=self.kwargs['pk_post']
-        )
+        form.instance.post = self.get_visible_post()
         return super().form_valid(form)
 
     def get_success_url(self) -> str:
@@ -116,20 +334,22 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class CommentUpdateView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
+class CommentUpdateView(
+    LoginRequiredMixin, VisiblePostMixin, OnlyAuthorMixin, UpdateView
+):
     """Представление для изменения комментария."""
 
     model = Comment
     form_class = CommentForm
-    pk_url_kwarg = 'pk_post'
+    pk_url_kwarg = 'pk_comment'
     template_name = 'blog/comment.html'
 
+    def get_queryset(self):
+        return Comment.objects.filter(post_id=self.kwargs['pk_post'])
+
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(
-            Post,
-            pk=self.kwargs['pk_post']
-        )
+        form.instance.post = self.get_visible_post()
         return super().form_valid(form)
 
     def get_success_url(self) -> str:
@@ -139,7 +359,9 @@ class CommentUpdateView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
         )
 
 
-class CommentDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
+class CommentDeleteView(
+    LoginRequiredMixin, VisiblePostMixin, OnlyAuthorMixin, DeleteView
+):
     """Представление для удаления комментария."""
 
     model = Comment
@@ -147,12 +369,12 @@ class CommentDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
     pk_url_kwarg = 'pk_comment'
     template_name = 'blog/comment.html'
 
+    def get_queryset(self):
+        return Comment.objects.filter(post_id=self.kwargs['pk_post'])
+
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(
-            Post,
-            pk=self.kwargs['pk_post']
-        )
+        form.instance.post = self.get_visible_post()
         return super().form_valid(form)
 
     def get_success_url(self) -> str:
@@ -193,6 +415,10 @@ class PostUpdateView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
     pk_url_kwarg = 'pk_post'
     template_name = 'blog/create.html'
 
+    def get_queryset(self):
+        # Чужую публикацию не прячем за 404: OnlyAuthorMixin перенаправит.
+        return Post.objects.select_related(*RELATED_FIELDS)
+
     def form_valid(self, form):
         form.instance.author = self.request.user
         return super().form_valid(form)
@@ -212,6 +438,10 @@ class PostDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
     pk_url_kwarg = 'pk_post'
     template_name = 'blog/create.html'
 
+    def get_queryset(self):
+        # Чужую публикацию не прячем за 404: OnlyAuthorMixin перенаправит.
+        return Post.objects.select_related(*RELATED_FIELDS)
+
     def get_success_url(self) -> str:
         return reverse_lazy(
             'blog:profile',
@@ -224,28 +454,19 @@ class PostDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
 # =============================================================================
 
 
-class ProfileListView(ListView):
+class ProfileListView(
+    AnonymousPageCacheMixin, ProfileFeedMixin, FeedPaginationMixin, ListView
+):
     """Страница пользователя."""
 
     model = Post
+    query_budget = 7
     paginate_by = PAGINATE_BY
     template_name = 'blog/profile.html'
 
     def get_queryset(self):
-        self.author = get_object_or_404(User, username=self.kwargs['username'])
-        db_manager = Post.objects.all() if (
-            self.author == self.request.user
-        ) else Post.objects_tailored.all()
-
-        FIELDS = ('author', 'category', 'location')
-
-        return make_comment_annotation(
-            db_manager.select_related(*FIELDS).filter(
-                author=self.author
-            )
-        ).order_by(
-            '-pub_date'
-        )
+        self.author = self.get_author()
+        return super().get_queryset()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
     'core.apps.CoreConfig',
+    'api.apps.ApiConfig',
 
     'django.contrib.admin',
     'django.contrib.auth',
@@ -50,6 +52,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -92,6 +96,27 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Version markers, the publication clock, pages and cards must be shared
+# by every worker process and management command, or invalidations stay
+# private to one process: hence a file cache rather than LocMem. Culling
+# only drops entries, which reads as a version bump, never as stale data.
+# Larger deployments can point the same keys at PyMemcacheCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    }
+}
+
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60 * 10
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -134,6 +159,14 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static_dev',
 ]
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+# collectstatic writes content-hashed names, optimized PNGs and .gz/.br
+# siblings; hashed files are served with a far-future immutable lifetime
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+STATIC_HASHED_MAX_AGE = 60 * 60 * 24 * 365
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -143,6 +176,18 @@ DEFAULT_LIMIT = 5
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
+# Media delivery: hand files to the front proxy instead of streaming them
+# through a worker. 'X-Sendfile' (Apache, lighttpd) or 'X-Accel-Redirect'
+# (nginx, with an internal location aliased to MEDIA_ROOT); None serves
+# files from Django itself
+MEDIA_SENDFILE_HEADER = None
+
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -150,3 +195,44 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 LOGIN_REDIRECT_URL = 'blog:index'
 
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+# Keyset (cursor) pagination of the post feeds instead of OFFSET
+POSTS_CURSOR_PAGINATION = False
+
+# Feed paginator: cached COUNT(*) and planner estimate for large feeds
+FEED_COUNT_CACHE_TIMEOUT = 300
+
+FEED_COUNT_ESTIMATE_THRESHOLD = 100_000
+
+# Atom/RSS documents are keyed by feed versions and dropped on any change
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Rendered post cards are keyed by object versions, so a long TTL is safe
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# SQL query budgets: N+1 bursts and over-budget views are logged
+# (or raised, as in the test suite)
+QUERY_BUDGET_RAISE = False
+
+QUERY_REPEAT_THRESHOLD = 5
+
+# On-demand image resizing: LRU disk cache of generated variants
+RESIZE_CACHE_ROOT = BASE_DIR / 'resize_cache'
+
+RESIZE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+RESIZE_CACHE_CONTROL_MAX_AGE = 60 * 60 * 24 * 365
+
+# Strip template indentation from HTML before compressing it
+HTML_MINIFY = True
+
+# Async read views (index, category, post, profile, static pages) for
+# ASGI, which sets BLOGICUM_ASYNC_VIEWS=1; their ORM and template work
+# runs in a bounded pool, one DB connection per worker thread
+ASYNC_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+
+ASYNC_ORM_WORKERS = 8
+
+# Lifetime of the pool's per-thread DB connections in seconds (None keeps
+# them forever); unlike CONN_MAX_AGE = 0 they outlive a single call
+ASYNC_ORM_CONN_MAX_AGE = 600
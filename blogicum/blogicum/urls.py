@@ -14,12 +14,13 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from core.media import MediaView, StaticView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('django.contrib.auth.urls')),
@@ -33,8 +34,19 @@ urlpatterns = [
         name='registration'
     ),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('api/v1/', include('api.urls', namespace='api')),
     path('', include('blog.urls', namespace='blog')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path(
+        f'{settings.MEDIA_URL.lstrip("/")}<path:path>',
+        MediaView.as_view(),
+        name='media'
+    ),
+    path(
+        f'{settings.STATIC_URL.lstrip("/")}<path:path>',
+        StaticView.as_view(),
+        name='static'
+    ),
+]
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.internal_server_error'
@@ -0,0 +1,183 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse,
+                         StreamingHttpResponse)
+from django.utils._os import safe_join
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.utils.http import http_date, parse_http_date_safe
+from django.views import View
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+# Сжатые копии из collectstatic в порядке предпочтения.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _byte_range(request, size, etag, last_modified):
+    """Запрошенный диапазон (start, end) включительно; None — весь файл.
+
+    Несколько диапазонов сразу, синтаксически неверный диапазон (конец
+    раньше начала) и устаревший If-Range отдают файл целиком; 416
+    остаётся для верных диапазонов за концом файла.
+    """
+    match = RANGE.match(request.META.get('HTTP_RANGE', '').strip())
+    if match is None:
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag and (
+        parse_http_date_safe(if_range) != last_modified
+    ):
+        return None
+    first, last = match.groups()
+    if not (first or last) or (first and last and int(last) < int(first)):
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, path, content_type=None, redirect_path=None,
+               max_age=None, immutable=False):
+    """Отдаёт файл с диска, по возможности не занимая воркер его байтами.
+
+    ``MEDIA_SENDFILE_HEADER`` поручает отдачу фронт-прокси: X-Sendfile
+    получает путь на диске, X-Accel-Redirect — внутренний адрес
+    ``redirect_path``. Иначе FileResponse отдаёт файл через
+    wsgi.file_wrapper (sendfile) с поддержкой ETag, If-Modified-Since и
+    Range. Время жизни в кеше по умолчанию — ``MEDIA_CACHE_MAX_AGE``.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise Http404('Файл не найден.')
+    if not os.path.isfile(path):
+        raise Http404('Файл не найден.')
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    content_type = content_type or (
+        mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    )
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    header = settings.MEDIA_SENDFILE_HEADER
+    if response is not None:
+        pass
+    elif header == 'X-Sendfile':
+        response = HttpResponse(content_type=content_type)
+        response[header] = path
+    elif header == 'X-Accel-Redirect' and redirect_path is not None:
+        response = HttpResponse(content_type=content_type)
+        response[header] = quote(redirect_path)
+    else:
+        byte_range = _byte_range(request, stat.st_size, etag, last_modified)
+        if byte_range is None:
+            response = FileResponse(
+                open(path, 'rb'), content_type=content_type
+            )
+        elif byte_range[0] > byte_range[1]:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(path, start, end - start + 1),
+                status=206,
+                content_type=content_type
+            )
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    cache_control = {'immutable': True} if immutable else {}
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=settings.MEDIA_CACHE_MAX_AGE if max_age is None else max_age,
+        **cache_control
+    )
+    return response
+
+
+class MediaView(View):
+    """Загруженные пользователями файлы из MEDIA_ROOT."""
+
+    query_budget = 0
+
+    def get(self, request, path):
+        try:
+            full_path = safe_join(settings.MEDIA_ROOT, path)
+        except SuspiciousFileOperation:
+            raise Http404('Файл не найден.')
+        return serve_file(
+            request,
+            full_path,
+            redirect_path=settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+        )
+
+
+def accepted_encodings(request):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых (q=0)."""
+    accepted = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00'):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticView(View):
+    """Собранная статика: вечный кеш для хешированных имён и сжатые копии."""
+
+    query_budget = 0
+
+    def get(self, request, path):
+        try:
+            full_path = safe_join(settings.STATIC_ROOT, path)
+        except SuspiciousFileOperation:
+            raise Http404('Файл не найден.')
+        content_type = mimetypes.guess_type(full_path)[0]
+        accepted = accepted_encodings(request)
+        chosen, encoding = full_path, None
+        for coding, extension in ENCODINGS:
+            if coding in accepted and os.path.isfile(full_path + extension):
+                chosen, encoding = full_path + extension, coding
+                break
+        hashed = HASHED_NAME.search(path) is not None
+        response = serve_file(
+            request,
+            chosen,
+            content_type=content_type,
+            max_age=settings.STATIC_HASHED_MAX_AGE if hashed else None,
+            immutable=hashed
+        )
+        if encoding and response.status_code != 304:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+from .media import accepted_encodings
+from .offload import query_recorder
+
+try:
+    import brotli
+except ImportError:  # Без Brotli ответы сжимаются только gzip.
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/|application/(json|javascript|xml|atom\+xml|rss\+xml)|'
+    r'image/svg\+xml)'
+)
+
+# Куски, где пробелы значимы, минификация не трогает.
+PRESERVED_HTML = re.compile(
+    r'(<(pre|textarea|script)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL
+)
+
+INDENTATION = re.compile(r'\n\s+')
+
+MIN_COMPRESS_LENGTH = 200
+
+BROTLI_QUALITY = 5
+
+
+class QueryBudgetExceeded(Exception):
+    """Запрос к странице вышел за бюджет SQL-запросов или породил N+1."""
+
+
+def fingerprint(sql):
+    """SQL без литералов: одинаковый для запросов, отличающихся данными."""
+    return LITERAL.sub('?', IN_LIST.sub('(%s)', sql))
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы страницы и ловит повторяющиеся (N+1).
+
+    Представление объявляет бюджет атрибутом ``query_budget``. Нарушения
+    пишутся в лог, а при ``QUERY_BUDGET_RAISE`` — поднимают исключение.
+    Запросы считаются в любом потоке, где идёт обработка: под ASGI это
+    и поток синхронного представления, и пул ``core.offload``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так Django узнаёт асинхронную цепочку, как у MiddlewareMixin.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        queries = []
+        token = query_recorder.set(self.recorder(queries))
+        try:
+            response = self.get_response(request)
+        finally:
+            query_recorder.reset(token)
+        self.check(request, queries)
+        return response
+
+    async def __acall__(self, request):
+        queries = []
+        token = query_recorder.set(self.recorder(queries))
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_recorder.reset(token)
+        self.check(request, queries)
+        return response
+
+    @staticmethod
+    def recorder(queries):
+        def record(execute, sql, params, many, context):
+            queries.append(fingerprint(sql))
+            return execute(sql, params, many, context)
+
+        return record
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        request.query_budget = getattr(view, 'query_budget', None)
+        request.query_budget_view = getattr(
+            view, '__name__', type(view).__name__
+        )
+
+    def check(self, request, queries):
+        view = getattr(request, 'query_budget_view', request.path)
+        problems = []
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and len(queries) > budget:
+            problems.append(
+                f'{view}: {len(queries)} SQL-запросов при бюджете {budget}'
+            )
+        for sql, repeats in Counter(queries).items():
+            if repeats >= settings.QUERY_REPEAT_THRESHOLD:
+                problems.append(
+                    f'{view}: запрос повторён {repeats} раз (N+1): {sql}'
+                )
+        if not problems:
+            return
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded('\n'.join(problems))
+        for problem in problems:
+            logger.warning(problem)
+
+
+def minify_html(html):
+    """Убирает отступы и пустые строки вне pre, textarea и script."""
+    parts = PRESERVED_HTML.split(html)
+    # split возвращает текст, сам сохраняемый блок и имя его тега.
+    return ''.join(
+        INDENTATION.sub('\n', part) if index % 3 == 0 else part
+        for index, part in enumerate(parts) if index % 3 != 2
+    )
+
+
+def _brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжимает текстовые ответы brotli или gzip, в том числе потоковые.
+
+    Кодировка выбирается по Accept-Encoding; ответы, уже сжатые, частичные
+    или нетекстовые (картинки, архивы), отдаются как есть. При
+    ``HTML_MINIFY`` из HTML предварительно убираются отступы шаблонов.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or (
+            response.status_code == 206
+        ) or not COMPRESSIBLE_TYPES.match(response.get('Content-Type', '')):
+            return response
+        if settings.HTML_MINIFY and not response.streaming and (
+            response['Content-Type'].startswith('text/html')
+        ):
+            response.content = minify_html(
+                response.content.decode(response.charset)
+            ).encode(response.charset)
+            response['Content-Length'] = str(len(response.content))
+        if not response.streaming and (
+            len(response.content) < MIN_COMPRESS_LENGTH
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(request)
+        if brotli is not None and 'br' in accepted:
+            encoding = 'br'
+        elif 'gzip' in accepted:
+            encoding = 'gzip'
+        else:
+            return response
+        if response.streaming:
+            response.streaming_content = (
+                _brotli_sequence if encoding == 'br' else compress_sequence
+            )(response.streaming_content)
+            del response['Content-Length']
+        else:
+            compressed = brotli.compress(
+                response.content, quality=BROTLI_QUALITY
+            ) if encoding == 'br' else compress_string(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,76 @@
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+# Регистратор SQL-запросов текущего HTTP-запроса (QueryBudgetMiddleware).
+# Соединения у каждого потока свои, а запрос страницы под ASGI ходит в БД
+# из потока sync_to_async и из пула, поэтому регистратор едет в контексте,
+# а обёртка стоит на всех соединениях.
+query_recorder = contextvars.ContextVar('query_recorder', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Обёртка соединений: передаёт запрос регистратору из контекста."""
+    record = query_recorder.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    return record(execute, sql, params, many, context)
+
+
+def install_recorder(sender, connection, **kwargs):
+    """Ставит record_query на новое соединение (сигнал connection_created)."""
+    # В начало списка: execute_wrapper() снимает обёртки с конца.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@functools.lru_cache(maxsize=None)
+def _executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.ASYNC_ORM_WORKERS, thread_name_prefix='orm'
+    )
+
+
+def _call(func, args, kwargs):
+    close_old_connections()
+    closed = [
+        connection for connection in connections.all()
+        if connection.connection is None
+    ]
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # Соединения потоков пула живут ASYNC_ORM_CONN_MAX_AGE, а не
+        # CONN_MAX_AGE: при нуле каждый вызов открывал бы новое.
+        max_age = settings.ASYNC_ORM_CONN_MAX_AGE
+        for connection in closed:
+            if connection.connection is not None:
+                connection.close_at = None if max_age is None else (
+                    time.monotonic() + max_age
+                )
+        close_old_connections()
+
+
+async def offload(func, *args, **kwargs):
+    """Выполняет синхронную работу (ORM, кеш, шаблоны) в пуле потоков.
+
+    В отличие от ``sync_to_async`` вызовы не выстраиваются в очередь к
+    одному потоку: пул из ``ASYNC_ORM_WORKERS`` потоков держит столько же
+    соединений с БД, а цикл событий тем временем обслуживает остальных.
+    Соединение потока переживает вызов и закрывается, только если
+    сломалось или прожило дольше ``ASYNC_ORM_CONN_MAX_AGE`` секунд.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _executor(), functools.partial(context.run, _call, func, args, kwargs)
+    )
+
+
+async def gather(*calls):
+    """Одновременно выполняет независимые вызовы без аргументов."""
+    return await asyncio.gather(*(offload(call) for call in calls))
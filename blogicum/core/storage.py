@@ -0,0 +1,81 @@
+import gzip
+import os
+from io import BytesIO
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from PIL import Image
+
+try:
+    import brotli
+except ImportError:  # Brotli необязателен: без него остаются .gz-копии.
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.ico'
+)
+
+# Сжатие ради пары процентов не стоит лишнего файла и распаковки.
+MIN_COMPRESSION_GAIN = 0.95
+
+
+def compressors():
+    yield '.gz', lambda data: gzip.compress(data, 9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda data: brotli.compress(data, quality=11)
+
+
+def optimize_png(path):
+    """Пересжимает PNG без потерь, если так получается меньше."""
+    with open(path, 'rb') as file:
+        original = file.read()
+    with Image.open(BytesIO(original)) as image:
+        buffer = BytesIO()
+        image.save(buffer, 'PNG', optimize=True)
+    if len(buffer.getvalue()) < len(original):
+        with open(path, 'wb') as file:
+            file.write(buffer.getvalue())
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешем в имени, сжатыми копиями и оптимизированными PNG.
+
+    Всё тяжёлое делается один раз в collectstatic: PNG пересжимаются до
+    хеширования, а рядом с хешированными текстовыми файлами кладутся
+    .gz и .br, которые отдаются без сжатия на лету.
+    """
+
+    # Без собранной статики (разработка, тесты) ссылки ведут на исходные
+    # имена, а не падают с ошибкой.
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name in paths:
+                if name.lower().endswith('.png'):
+                    optimize_png(self.path(name))
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Сжимаем только итоговые имена: промежуточные копии из проходов
+        # по CSS к этому моменту уже удалены.
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as file:
+            data = file.read()
+        for extension, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) < len(data) * MIN_COMPRESSION_GAIN:
+                with open(path + extension, 'wb') as file:
+                    file.write(compressed)
+            elif os.path.exists(path + extension):
+                os.remove(path + extension)
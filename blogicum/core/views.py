@@ -0,0 +1,57 @@
+from django.http import HttpResponseNotAllowed
+from django.shortcuts import render
+
+from .offload import offload
+
+
+class AsyncTemplateView:
+    """Асинхронный TemplateView для чтения под ASGI.
+
+    Django 3.2 не умеет асинхронные методы в View, поэтому ``as_view``
+    возвращает корутину. Всё синхронное — сессия и пользователь, ORM,
+    шаблоны — уходит в пул ``offload``, а цикл событий только ждёт.
+    """
+
+    http_method_names = ('get', 'head')
+    template_name = None
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.request, self.args, self.kwargs = request, args, kwargs
+            return await self.dispatch(request, *args, **kwargs)
+
+        view.view_class = cls
+        view.view_initkwargs = initkwargs
+        view.__doc__ = cls.__doc__
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method.lower() not in self.http_method_names:
+            return HttpResponseNotAllowed(
+                [method.upper() for method in self.http_method_names]
+            )
+        response = await offload(self.prepare)
+        if response is None:
+            context = await self.get_context_data(**kwargs)
+            response = await offload(self.render, context)
+        return response
+
+    def prepare(self):
+        """Синхронная подготовка в пуле; вернув ответ, прерывает запрос.
+
+        Пользователь читается из сессии здесь, чтобы дальше обращения к
+        нему не ходили в БД из цикла событий.
+        """
+        self.request.user.is_authenticated
+
+    async def get_context_data(self, **kwargs):
+        return {'view': self, **kwargs}
+
+    def render(self, context):
+        return render(self.request, self.template_name, context)
@@ -1,17 +1,22 @@
+from django.conf import settings
 from django.urls import path
 from django.views.generic.base import TemplateView
 
+from core.views import AsyncTemplateView
+
 app_name = 'pages'
 
+page_view = AsyncTemplateView if settings.ASYNC_VIEWS else TemplateView
+
 urlpatterns = [
     path(
         'about/',
-        TemplateView.as_view(template_name=f'{app_name}/about.html'),
+        page_view.as_view(template_name=f'{app_name}/about.html'),
         name='about'
     ),
     path(
         'rules/',
-        TemplateView.as_view(template_name=f'{app_name}/rules.html'),
+        page_view.as_view(template_name=f'{app_name}/rules.html'),
         name='rules'
     ),
 ]
@@ -0,0 +1,249 @@
+"""Бенчмарк маршрутов: число SQL-запросов, объём страницы и задержка.
+
+В сборку тестов по умолчанию не входит, запускается явно:
+
+    pytest tests/benchmarks/bench_urls.py
+
+Число запросов и объём страницы не зависят от машины и сверяются с базой
+напрямую. Задержка сверяется только как p50 относительно калибровочного
+маршрута (``CALIBRATION_ROUTE``), запросы к которому чередуются с
+замеряемыми: так сравнимы прогоны на разных машинах и при разной
+нагрузке. Абсолютные p50/p95 лишь выводятся и пишутся в файл результатов.
+
+Окружение:
+    BENCH_SCALE — во сколько раз размножить публикации из db.json (50);
+    BENCH_REPEAT — сколько раз запрашивать каждый маршрут (20);
+    BENCH_TOLERANCE — допустимый рост объёма страницы и относительной
+        задержки, доля (0.5);
+    BENCH_RESULTS — файл результатов прогона (results.json рядом);
+    BENCH_UPDATE_BASELINE=1 — перезаписать baseline.json результатами.
+"""
+import json
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Category, Comment, Post
+from blog.publication import publication_clock
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DATASET = ROOT_DIR / "db.json"
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+RESULTS = Path(os.environ.get(
+    "BENCH_RESULTS", Path(__file__).resolve().parent / "results.json"
+))
+
+SCALE = int(os.environ.get("BENCH_SCALE", 50))
+REPEAT = int(os.environ.get("BENCH_REPEAT", 20))
+TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", 0.5))
+UPDATE_BASELINE = os.environ.get("BENCH_UPDATE_BASELINE") == "1"
+COMMENTS_PER_HOT_POST = 200
+# Дешёвая статическая страница: эталон скорости машины для задержек.
+CALIBRATION_ROUTE = "about"
+
+ROUTES = [
+    "index", "index_deep", "index_cursor", "category_posts", "post_detail",
+    "post_detail_anonymous", "profile", "profile_own", "add_comment",
+    "edit_post", "delete_post", "edit_comment", "delete_comment",
+    "create_post", "edit_profile", "about", "rules", "login",
+    "registration", "password_change", "password_reset",
+]
+
+results = {}
+
+
+def scale_dataset():
+    """Размножает публикации из db.json и добавляет обсуждения."""
+    rng = random.Random(0)
+    originals = list(Post.objects.all())
+    users = list(get_user_model().objects.all())
+    copies = [
+        Post(
+            title=post.title,
+            text=post.text,
+            pub_date=post.pub_date - timedelta(days=copy),
+            author_id=post.author_id,
+            category_id=post.category_id,
+            location_id=post.location_id,
+            is_published=post.is_published,
+        )
+        for copy in range(1, SCALE)
+        for post in originals
+    ]
+    Post.objects.bulk_create(copies, batch_size=500)
+    hot_post = Post.objects_tailored.first()
+    Comment.objects.bulk_create(
+        Comment(
+            post=hot_post,
+            author=hot_post.author if number == 0 else rng.choice(users),
+            text=f"Комментарий {number}",
+        )
+        for number in range(COMMENTS_PER_HOT_POST)
+    )
+    Post.objects.filter(pk=hot_post.pk).update(
+        comment_count=COMMENTS_PER_HOT_POST
+    )
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        call_command(
+            "loaddata", str(DATASET), verbosity=0,
+            exclude=["auth.permission", "admin", "sessions", "contenttypes"],
+        )
+        scale_dataset()
+        post = Post.objects_tailored.order_by("-comment_count").first()
+        yield {
+            "author": post.author,
+            "post": post,
+            "comment": post.comments.filter(author=post.author).first(),
+            "category": Category.objects.filter(is_published=True).first(),
+        }
+        call_command("flush", interactive=False, verbosity=0)
+    report = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    RESULTS.write_text(report)
+    if UPDATE_BASELINE:
+        BASELINE.write_text(report)
+
+
+@pytest.fixture
+def report(request):
+    """Строка в вывод pytest, минуя перехват stdout."""
+    plugins = request.config.pluginmanager
+    capture = plugins.get_plugin("capturemanager")
+    reporter = plugins.get_plugin("terminalreporter")
+
+    def write(line):
+        with capture.global_and_fixture_disabled():
+            reporter.write_line(line)
+
+    return write
+
+
+def route_request(name, data):
+    """Адрес маршрута и от чьего имени его запрашивать."""
+    post, comment = data["post"], data["comment"]
+    author = data["author"].username
+    return {
+        "index": ("/", True),
+        "index_deep": (f"/?page={SCALE}", True),
+        "index_cursor": ("/?cursor=", True),
+        "category_posts": (f"/category/{data['category'].slug}/", True),
+        "post_detail": (f"/posts/{post.id}/", True),
+        "post_detail_anonymous": (f"/posts/{post.id}/", False),
+        "profile": (f"/profile/{author}/", False),
+        "profile_own": (f"/profile/{author}/", True),
+        "add_comment": (f"/posts/{post.id}/comment/", True),
+        "edit_post": (f"/posts/{post.id}/edit/", True),
+        "delete_post": (f"/posts/{post.id}/delete/", True),
+        "edit_comment": (
+            f"/posts/{post.id}/edit_comment/{comment.id}/", True
+        ),
+        "delete_comment": (
+            f"/posts/{post.id}/delete_comment/{comment.id}/", True
+        ),
+        "create_post": ("/posts/create/", True),
+        "edit_profile": ("/profile/edit/", True),
+        "about": ("/pages/about/", False),
+        "rules": ("/pages/rules/", False),
+        "login": ("/auth/login/", False),
+        "registration": ("/auth/registration/", False),
+        "password_change": ("/auth/password_change/", True),
+        "password_reset": ("/auth/password_reset/", False),
+    }[name]
+
+
+def reset_cache():
+    cache.clear()
+    # Часы публикаций общие для процесса и в работе всегда прогреты.
+    publication_clock()
+
+
+def timed_get(client, url):
+    start = time.perf_counter()
+    response = client.get(url)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200, f"{url}: {response.status_code}"
+    return elapsed, response
+
+
+def measure(client, url, reference_url):
+    """Замер маршрута вперемешку с калибровочным ``reference_url``."""
+    reference = Client()
+    for warm_up in (client, url), (reference, reference_url):
+        reset_cache()
+        timed_get(*warm_up)
+    timings, reference_timings = [], []
+    for _ in range(REPEAT):
+        reset_cache()
+        reference_timings.append(timed_get(reference, reference_url)[0])
+        reset_cache()
+        with CaptureQueriesContext(connection) as queries:
+            elapsed, response = timed_get(client, url)
+        timings.append(elapsed)
+    p50 = statistics.median(timings)
+    return {
+        "p50_ms": round(p50 * 1000, 2),
+        "relative_p50": round(p50 / statistics.median(reference_timings), 2),
+        # Интерполяция между выборками, а не самый медленный запрос.
+        "p95_ms": round(
+            statistics.quantiles(timings, n=20, method="inclusive")[-1]
+            * 1000, 2
+        ),
+        "queries": len(queries),
+        "bytes": len(response.content),
+    }
+
+
+def regressions(name, measured, baseline):
+    """Расхождения с базой; из задержек сверяется только относительная."""
+    problems = []
+    limit = baseline["relative_p50"] * (1 + TOLERANCE)
+    if measured["relative_p50"] > limit:
+        problems.append(
+            f"{name}: relative_p50 {measured['relative_p50']} > {limit:.2f}"
+            f" (база {baseline['relative_p50']})"
+        )
+    limit = baseline["bytes"] * (1 + TOLERANCE)
+    if measured["bytes"] > limit:
+        problems.append(
+            f"{name}: bytes {measured['bytes']} > {limit:.0f}"
+            f" (база {baseline['bytes']})"
+        )
+    if measured["queries"] > baseline["queries"]:
+        problems.append(
+            f"{name}: {measured['queries']} SQL-запросов вместо"
+            f" {baseline['queries']}"
+        )
+    return problems
+
+
+@pytest.mark.parametrize("name", ROUTES)
+def test_route_speed(name, dataset, report):
+    url, logged_in = route_request(name, dataset)
+    client = Client()
+    if logged_in:
+        client.force_login(dataset["author"])
+    reference_url, _ = route_request(CALIBRATION_ROUTE, dataset)
+    measured = results[name] = measure(client, url, reference_url)
+    report(f"{name:>24} {url:<40} {measured}")
+
+    if UPDATE_BASELINE or not BASELINE.exists():
+        return
+    baseline = json.loads(BASELINE.read_text()).get(name)
+    if baseline is None:
+        pytest.skip(f"Для маршрута {name} нет базовых значений")
+    problems = regressions(name, measured, baseline)
+    assert not problems, "\n".join(problems)
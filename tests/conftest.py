@@ -41,6 +41,77 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def raise_on_query_budget():
+    with override_settings(QUERY_BUDGET_RAISE=True):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    yield tmp_path
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_location(tmp_path_factory):
+    from django.conf import settings
+
+    caches = {"default": {
+        **settings.CACHES["default"],
+        "LOCATION": tmp_path_factory.mktemp("cache"),
+    }}
+    with override_settings(CACHES=caches):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(cache_location):
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def run_on_commit_hooks(request, monkeypatch):
+    """Транзакция теста ведёт себя как автокоммит.
+
+    Иначе on_commit, которым сдвигаются метки кеша, не сработал бы никогда:
+    здесь колбэки выполняются, как только закрыт последний atomic() кода.
+    """
+    marker = request.node.get_closest_marker("django_db")
+    if marker is None or marker.kwargs.get("transaction") or (
+        marker.args and marker.args[0]
+    ):
+        yield
+        return
+    request.getfixturevalue("db")
+    from django.db import connections, transaction
+
+    connection = connections["default"]
+    depth = len(connection.savepoint_ids)
+    original_on_commit = connection.on_commit
+    original_exit = transaction.Atomic.__exit__
+
+    def on_commit(func):
+        if len(connection.savepoint_ids) == depth:
+            func()
+        else:
+            original_on_commit(func)
+
+    def exit(self, exc_type, exc_value, traceback):
+        original_exit(self, exc_type, exc_value, traceback)
+        if len(connection.savepoint_ids) == depth:
+            hooks, connection.run_on_commit = connection.run_on_commit, []
+            for _, func in hooks:
+                func()
+
+    monkeypatch.setattr(connection, "on_commit", on_commit)
+    monkeypatch.setattr(transaction.Atomic, "__exit__", exit)
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
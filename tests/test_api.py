@@ -0,0 +1,157 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, post_with_published_location):
+    visible = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", author=visible.author, category=visible.category,
+        is_published=False, pub_date=timezone.now() - timedelta(days=1),
+    )
+    return visible, hidden
+
+
+def results(response):
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+def test_posts_follow_visibility_rules(client, posts):
+    visible, hidden = posts
+    feed = results(client.get("/api/v1/posts/"))
+    assert [post["id"] for post in feed] == [visible.pk], (
+        "API должно показывать только опубликованное."
+    )
+    client.force_login(visible.author)
+    own = results(
+        client.get(f"/api/v1/posts/?author={visible.author.username}")
+    )
+    assert {post["id"] for post in own} == {visible.pk, hidden.pk}, (
+        "Автор видит в API все свои публикации, как в профиле."
+    )
+
+
+def test_post_detail_hides_unpublished(client, posts):
+    visible, hidden = posts
+    assert client.get(f"/api/v1/posts/{hidden.pk}/").status_code == 404
+    data = client.get(f"/api/v1/posts/{visible.pk}/").json()
+    assert data["title"] == visible.title
+    assert data["category"] == visible.category.slug
+    assert data["author"] == visible.author.username
+
+
+def test_sparse_fieldset_reads_only_requested_columns(client, posts):
+    visible = posts[0]
+    with CaptureQueriesContext(connection) as queries:
+        data = client.get(f"/api/v1/posts/{visible.pk}/?fields=id,title")
+    assert data.json() == {"id": visible.pk, "title": visible.title}
+    selects = [
+        query["sql"] for query in queries
+        if '"blog_post"."title"' in query["sql"]
+    ]
+    assert selects and all(
+        '"blog_post"."text"' not in sql for sql in selects
+    ), "Ненужные столбцы не должны читаться из БД."
+    response = client.get("/api/v1/posts/?fields=id,password")
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_batch_fetch_by_ids_keeps_order(client, mixer, posts):
+    visible, hidden = posts
+    other = mixer.blend(
+        "blog.Post", author=visible.author, category=visible.category,
+        location=None, is_published=True,
+        pub_date=timezone.now() - timedelta(days=2),
+    )
+    ids = f"{other.pk},{hidden.pk},{visible.pk}"
+    data = results(client.get(f"/api/v1/posts/?ids={ids}&fields=id"))
+    assert data == [{"id": other.pk}, {"id": visible.pk}], (
+        "Пачка по id должна сохранять порядок и пропускать скрытое."
+    )
+    assert client.get("/api/v1/posts/?ids=a").status_code == 400
+
+
+def test_cursor_pagination(client, mixer, posts):
+    visible = posts[0]
+    mixer.cycle(4).blend(
+        "blog.Post", author=visible.author, category=visible.category,
+        location=None, is_published=True,
+        pub_date=(
+            timezone.now() - timedelta(days=number)
+            for number in range(2, 6)
+        ),
+    )
+    seen = []
+    url = "/api/v1/posts/?limit=2&fields=id"
+    while url:
+        data = client.get(url).json()
+        seen += [post["id"] for post in data["results"]]
+        url = data["next"] and (
+            f"/api/v1/posts/?limit=2&fields=id&cursor={data['next']}"
+        )
+    assert len(seen) == len(set(seen)) == 5, (
+        "Курсор должен обойти ленту без пропусков и повторов."
+    )
+
+
+def test_comments_and_etag(client, mixer, posts):
+    visible, hidden = posts
+    mixer.cycle(3).blend("blog.Comment", post=visible, author=visible.author)
+    url = f"/api/v1/posts/{visible.pk}/comments/?limit=2"
+    first = client.get(url).json()
+    second = client.get(f"{url}&cursor={first['next']}").json()
+    assert len(first["results"]) == 2 and len(second["results"]) == 1
+    assert second["next"] is None
+    assert client.get(
+        f"/api/v1/posts/{hidden.pk}/comments/"
+    ).status_code == 404
+
+    response = client.get(url)
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 304, "Совпавший ETag должен давать 304."
+
+
+def test_categories_and_profile(client, posts):
+    visible = posts[0]
+    assert results(client.get("/api/v1/categories/?fields=slug")) == [
+        {"slug": visible.category.slug}
+    ]
+    data = client.get(
+        f"/api/v1/profiles/{visible.author.username}/"
+    ).json()
+    assert data["username"] == visible.author.username
+    assert "password" not in data and "email" not in data
+    assert client.get("/api/v1/profiles/missing/").status_code == 404
+
+
+def test_author_filter_for_anonymous(client, posts):
+    assert results(client.get("/api/v1/posts/?author=")) == [], (
+        "Пустой автор у анонима не должен ронять API."
+    )
+
+
+def test_own_author_filter_keeps_category(client, mixer, posts):
+    visible, hidden = posts
+    other_category = mixer.blend("blog.Category", is_published=True)
+    mixer.blend(
+        "blog.Post", author=visible.author, category=other_category,
+        location=None, is_published=True,
+        pub_date=timezone.now() - timedelta(days=2),
+    )
+    client.force_login(visible.author)
+    own = results(client.get(
+        f"/api/v1/posts/?author={visible.author.username}"
+        f"&category={visible.category.slug}&fields=id"
+    ))
+    assert {post["id"] for post in own} == {visible.pk, hidden.pk}, (
+        "Фильтр по категории должен сохраняться и для своих публикаций."
+    )
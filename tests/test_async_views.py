@@ -0,0 +1,125 @@
+import asyncio
+from importlib import reload
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.test.client import AsyncClient
+from django.urls import clear_url_caches, resolve
+
+import blog.urls
+import blogicum.urls
+import pages.urls
+from api import views as api_views
+from blog import async_views
+from blog.models import Post
+from core.middleware import QueryBudgetExceeded
+from core.offload import gather
+
+# Пул потоков ходит в БД своими соединениями и не видит данных внутри
+# транзакции теста.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def reload_urls():
+    for module in (blog.urls, pages.urls, blogicum.urls):
+        reload(module)
+    clear_url_caches()
+
+
+@pytest.fixture(autouse=True)
+def async_urls(settings):
+    settings.ASYNC_VIEWS = True
+    reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    reload_urls()
+
+
+@pytest.fixture
+def post(mixer, post_with_published_location):
+    mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location,
+        author=post_with_published_location.author, text="Комментарий",
+    )
+    return post_with_published_location
+
+
+def test_read_views_are_async(post):
+    for url in (
+        "/", f"/category/{post.category.slug}/", f"/posts/{post.pk}/",
+        f"/profile/{post.author.username}/", "/pages/about/",
+    ):
+        assert asyncio.iscoroutinefunction(resolve(url).func), (
+            f"Под ASGI страница {url} должна быть асинхронной."
+        )
+
+
+def test_async_pages_render(client, post):
+    urls = {
+        "/": post.title,
+        f"/category/{post.category.slug}/": post.title,
+        f"/profile/{post.author.username}/": post.author.username,
+        f"/posts/{post.pk}/": "Комментарий",
+        "/pages/rules/": "",
+    }
+    for url, text in urls.items():
+        response = client.get(url)
+        assert response.status_code == 200, url
+        assert text in response.content.decode(), url
+        assert client.get(url).content == response.content, (
+            "Повторный запрос анонима должен отдаваться из кеша страниц."
+        )
+    assert client.get("/category/missing/").status_code == 404
+    assert client.get("/posts/0/").status_code == 404
+    assert client.get("/?page=100").status_code == 404
+
+
+def test_async_detail_hides_unpublished(client, user_client, post):
+    post.is_published = False
+    post.save()
+    assert client.get(f"/posts/{post.pk}/").status_code == 404
+    assert user_client.get(f"/posts/{post.pk}/").status_code == 200, (
+        "Автор видит свою снятую с публикации запись."
+    )
+
+
+def test_async_views_count_offloaded_queries(
+        user_client, monkeypatch, post):
+    monkeypatch.setattr(async_views.PostListView, "query_budget", 1)
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get("/")
+
+
+def test_concurrent_asgi_requests(post):
+    client = AsyncClient()
+    urls = ["/", f"/posts/{post.pk}/", "/pages/about/"] * 5
+
+    async def fetch_all():
+        return await asyncio.gather(*(client.get(url) for url in urls))
+
+    responses = async_to_sync(fetch_all)()
+    assert [response.status_code for response in responses] == (
+        [200] * len(urls)
+    )
+
+
+def test_asgi_counts_sync_view_queries(monkeypatch, post):
+    monkeypatch.setattr(api_views.PostListView, "query_budget", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        async_to_sync(AsyncClient().get)("/api/v1/posts/")
+
+
+def test_offload_keeps_connections_open(monkeypatch, post):
+    wrapper = type(connections["default"])
+    closed = []
+    close = wrapper.close
+    monkeypatch.setattr(
+        wrapper, "close", lambda self: closed.append(self) or close(self)
+    )
+    for _ in range(10):
+        async_to_sync(gather)(Post.objects.count, Post.objects.count)
+    assert not closed, (
+        "Потоки пула должны держать свои соединения с БД, а не закрывать "
+        "их после каждого вызова."
+    )
@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def suggestions(client, query):
+    response = client.get("/autocomplete/", {"q": query})
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+def test_autocomplete_matches_word_prefixes(user_client, mixer):
+    mixer.blend("blog.Category", title="Горные походы", slug="mountains",
+                is_published=True)
+    mixer.blend("blog.Category", title="Горы скрытые", is_published=False)
+    mixer.blend("blog.Location", name="Горно-Алтайск", is_published=True)
+    mixer.blend("auth.User", username="gorynych")
+    labels = {item["label"] for item in suggestions(user_client, "гор")}
+    assert labels == {"Горные походы", "Горно-Алтайск"}, (
+        "Подсказки должны находить опубликованные категории и места"
+        " по началу слова без учёта регистра."
+    )
+    category, = suggestions(user_client, "похо")
+    assert category["url"] == "/category/mountains/"
+    author, = suggestions(user_client, "GORY")
+    assert author["url"] == "/profile/gorynych/"
+
+
+def test_autocomplete_is_updated_incrementally(user_client, mixer):
+    assert not suggestions(user_client, "байкал")
+    location = mixer.blend("blog.Location", name="Байкал", is_published=True)
+    assert [item["label"] for item in suggestions(user_client, "байк")] == [
+        "Байкал"
+    ]
+    location.name = "Ладога"
+    location.save()
+    assert not suggestions(user_client, "байк")
+    assert suggestions(user_client, "лад")
+    location.delete()
+    assert not suggestions(user_client, "лад"), (
+        "Индекс подсказок должен следовать за изменениями объектов."
+    )
+
+
+def test_autocomplete_does_not_touch_database(user_client, mixer):
+    mixer.blend("blog.Location", name="Эльбрус", is_published=True)
+    suggestions(user_client, "эль")
+    with CaptureQueriesContext(connection) as queries:
+        assert suggestions(user_client, "эльб")
+    assert not queries, (
+        "Подсказки должны отвечать из памяти, не обращаясь к БД."
+    )
+
+
+def test_login_keeps_autocomplete_version(client, user):
+    from django.contrib.auth.models import update_last_login
+
+    from blog.caching import AUTOCOMPLETE_MARKER, get_versions
+
+    before = get_versions([AUTOCOMPLETE_MARKER])
+    update_last_login(None, user)
+    assert get_versions([AUTOCOMPLETE_MARKER]) == before, (
+        "Вход пользователя не должен перестраивать подсказки."
+    )
+    user.is_active = False
+    user.save()
+    assert get_versions([AUTOCOMPLETE_MARKER]) != before
+
+
+def test_autocomplete_reloads_after_foreign_change(user_client, mixer):
+    from blog.caching import AUTOCOMPLETE_MARKER, touch
+    from blog.models import Location
+
+    location = mixer.blend("blog.Location", name="Онега", is_published=True)
+    assert suggestions(user_client, "оне")
+    # Другой процесс переименовал место: строка в БД и версия в кеше.
+    Location.objects.filter(pk=location.pk).update(name="Селигер")
+    touch(AUTOCOMPLETE_MARKER)
+    mixer.blend("blog.Location", name="Валдай", is_published=True)
+    assert suggestions(user_client, "сел"), (
+        "Своя правка не должна скрывать изменения других процессов."
+    )
+    assert suggestions(user_client, "вал")
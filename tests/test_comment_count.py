@@ -0,0 +1,47 @@
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer: Mixer, post_with_published_location,
+        post_of_another_author):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что счётчик комментариев увеличивается при создании"
+        " комментария."
+    )
+
+    comments[0].delete()
+    moved = comments[1]
+    moved.post = post_of_another_author
+    moved.save()
+    post.refresh_from_db()
+    post_of_another_author.refresh_from_db()
+    assert (post.comment_count, post_of_another_author.comment_count) == (1, 1)
+
+
+def test_post_save_keeps_comment_count(
+        mixer: Mixer, post_with_published_location):
+    stale = type(post_with_published_location).objects.get(
+        pk=post_with_published_location.pk
+    )
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    stale.title = "Новый заголовок"
+    stale.save()
+    stale.refresh_from_db()
+    assert stale.comment_count == 1
+
+
+def test_reconcile_comment_counts(
+        mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=7)
+    call_command("reconcile_comment_counts")
+    post.refresh_from_db()
+    assert post.comment_count == 2
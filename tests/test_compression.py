@@ -0,0 +1,56 @@
+import gzip
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from core.middleware import CompressionMiddleware, minify_html
+
+pytestmark = [pytest.mark.django_db]
+
+HTML = "<div>\n    <p>Текст</p>\n\n    <pre>\n  код\n</pre>\n</div>" * 20
+
+
+def compress(response, accept="gzip, deflate"):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def test_feed_page_is_minified_and_gzipped(
+        client, post_with_published_location):
+    plain = client.get("/")
+    compressed = client.get("/", HTTP_ACCEPT_ENCODING="gzip")
+    assert compressed["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed["Vary"]
+    html = gzip.decompress(compressed.content)
+    assert html == plain.content
+    assert b"\n    " not in html, "Отступы шаблонов должны убираться из HTML."
+    assert len(compressed.content) < len(html)
+
+
+def test_minify_keeps_preformatted_text():
+    assert minify_html(HTML).startswith(
+        "<div>\n<p>Текст</p>\n<pre>\n  код\n</pre>\n</div>"
+    ), "Пробелы внутри pre, textarea и script значимы и должны сохраняться."
+
+
+def test_streaming_response_is_compressed():
+    response = compress(
+        StreamingHttpResponse((chunk.encode() for chunk in [HTML] * 5))
+    )
+    assert response["Content-Encoding"] == "gzip"
+    assert not response.has_header("Content-Length")
+    assert gzip.decompress(
+        b"".join(response.streaming_content)
+    ) == HTML.encode() * 5
+
+
+@pytest.mark.parametrize("response, accept", [
+    (HttpResponse(b"\x89PNG" * 100, content_type="image/png"), "gzip"),
+    (HttpResponse(HTML), "identity"),
+    (HttpResponse(HTML), "gzip;q=0"),
+])
+def test_uncompressible_responses_are_untouched(response, accept):
+    assert not compress(response, accept).has_header("Content-Encoding"), (
+        "Изображения и клиенты без поддержки сжатия получают ответ как есть."
+    )
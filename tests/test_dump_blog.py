@@ -0,0 +1,68 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from blog.dump import DUMP_MODELS
+from blog.models import Category, Comment, Post
+from blog.search import SearchPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+def snapshot():
+    return {
+        model: list(model._default_manager.order_by("pk").values())
+        for model in DUMP_MODELS
+    }
+
+
+@pytest.fixture
+def blog_data(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=post.author)
+    mixer.cycle(4).blend(
+        "blog.Post", author=post.author, category=post.category,
+        location=None, title="Уникальный заголовок",
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    # Даты создания не должны переписываться auto_now_add при загрузке.
+    Category.objects.update(created_at=timezone.now() - timedelta(days=30))
+    return post
+
+
+@pytest.mark.parametrize("name", ["dump.jsonl", "dump.jsonl.gz"])
+def test_dump_and_load_round_trip(blog_data, tmp_path, name):
+    path = str(tmp_path / name)
+    before = snapshot()
+    call_command("dump_blog", path, batch_size=2, stdout=StringIO())
+    for model in reversed(DUMP_MODELS):
+        model._default_manager.all().delete()
+
+    output = StringIO()
+    call_command(
+        "load_blog", path, batch_size=2, transaction_size=3, stdout=output
+    )
+    assert snapshot() == before, (
+        "После выгрузки и загрузки данные должны совпадать до поля."
+    )
+    assert output.getvalue().count("Загружено") > 1, (
+        "Загрузка должна сообщать о ходе работы после каждой транзакции."
+    )
+    assert Comment.objects.count() == Post.objects.get(
+        pk=blog_data.pk
+    ).comment_count
+    page = SearchPaginator(
+        Post.objects_tailored.all(), 10, "уникальный"
+    ).page(None)
+    assert len(page) == 4, "Загруженные публикации должны попасть в индекс."
+
+
+def test_load_rejects_broken_lines(blog_data, tmp_path):
+    path = tmp_path / "broken.jsonl"
+    path.write_text('{"model": "blog.category", "pk": 1000, "fields": {\n')
+    with pytest.raises(CommandError, match="Загрузка остановлена"):
+        call_command("load_blog", str(path), stdout=StringIO())
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from xml.etree import ElementTree
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def titles(response):
+    assert response.status_code == 200
+    root = ElementTree.fromstring(response.content)
+    if root.tag == f"{ATOM}feed":
+        return [entry.find(f"{ATOM}title").text
+                for entry in root.iter(f"{ATOM}entry")]
+    return [item.find("title").text for item in root.iter("item")]
+
+
+@pytest.fixture
+def posts(mixer, post_with_published_location):
+    visible = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", author=visible.author, category=visible.category,
+        is_published=False,
+    )
+    future = mixer.blend(
+        "blog.Post", author=visible.author, category=visible.category,
+        is_published=True, pub_date=timezone.now() + timedelta(days=1),
+    )
+    return visible, hidden, future
+
+
+@pytest.mark.parametrize("kind", ["rss", "atom"])
+def test_feeds_follow_visibility_rules(client, posts, kind):
+    visible = posts[0]
+    urls = [
+        f"/{kind}/",
+        f"/category/{visible.category.slug}/{kind}/",
+        f"/profile/{visible.author.username}/{kind}/",
+    ]
+    for url in urls:
+        assert titles(client.get(url)) == [visible.title], (
+            "В ленты попадают только публикации, видимые на сайте."
+        )
+
+
+def test_feed_answers_not_modified(client, posts):
+    response = client.get("/atom/")
+    assert response["ETag"].startswith('"')
+    with CaptureQueriesContext(connection) as queries:
+        not_modified = client.get(
+            "/atom/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+    assert not_modified.status_code == 304
+    assert not queries, "Повторный опрос ленты не должен обращаться к БД."
+    assert client.get(
+        "/atom/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    ).status_code == 304
+
+
+@pytest.mark.parametrize("kind", ["rss", "atom"])
+def test_object_feeds_answer_not_modified(client, posts, kind):
+    visible = posts[0]
+    for url in (
+        f"/category/{visible.category.slug}/{kind}/",
+        f"/profile/{visible.author.username}/{kind}/",
+    ):
+        etag = client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert not_modified.status_code == 304, url
+        assert not queries, (
+            f"Повторный опрос ленты {url} не должен обращаться к БД."
+        )
+
+
+def test_author_feed_follows_rename(client, posts):
+    author = posts[0].author
+    old_url = f"/profile/{author.username}/atom/"
+    assert client.get(old_url).status_code == 200
+    author.username = "renamed_author"
+    author.save()
+    assert client.get(old_url).status_code == 404
+    assert client.get("/profile/renamed_author/atom/").status_code == 200
+
+
+def test_feed_cache_is_dropped_on_change(client, posts):
+    visible = posts[0]
+    etag = client.get("/rss/")["ETag"]
+    visible.title = "Новый заголовок"
+    visible.save()
+    response = client.get("/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert titles(response) == ["Новый заголовок"], (
+        "После изменения публикации лента должна пересобираться."
+    )
+
+
+def test_unknown_feed_objects(client, posts):
+    assert client.get("/category/missing/rss/").status_code == 404
+    assert client.get("/profile/missing/atom/").status_code == 404
+
+
+def test_last_modified_moves_on_edit(client, posts, monkeypatch):
+    import blog.feeds
+
+    visible = posts[0]
+    monkeypatch.setattr(blog.feeds.time, "time", lambda: 1_000_000_000)
+    last_modified = client.get("/rss/")["Last-Modified"]
+    visible.title = "Правка без новой даты"
+    visible.save()
+    monkeypatch.setattr(blog.feeds.time, "time", lambda: 1_000_000_060)
+    response = client.get("/rss/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200, (
+        "Клиент с одним If-Modified-Since должен увидеть правку публикации."
+    )
+    assert response["Last-Modified"] != last_modified
@@ -0,0 +1,104 @@
+from io import BytesIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+ORIENTATION = 0x0112
+
+
+def upload(size=(1600, 900), orientation=None, name="photo.jpg"):
+    image = Image.new("RGB", size, "red")
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    if orientation:
+        exif[ORIENTATION] = orientation
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", exif=exif.tobytes())
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/jpeg")
+
+
+def test_renditions_are_generated_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.image = upload(orientation=6)
+    post.save()
+    post.refresh_from_db()
+    renditions = post.image_meta["renditions"]
+    assert post.image_meta["source"] == post.image.name
+    assert [width for width, _ in renditions["jpeg"]] == [320, 640, 900]
+    assert [width for width, _ in renditions["webp"]] == [320, 640, 900]
+    storage = post.image.storage
+    with Image.open(storage.open(renditions["jpeg"][0][1])) as copy:
+        assert copy.size == (320, 569), (
+            "Копии должны учитывать ориентацию из EXIF."
+        )
+        assert not copy.getexif(), "Копии не должны содержать метаданные."
+    with Image.open(storage.open(renditions["webp"][0][1])) as copy:
+        assert copy.format == "WEBP"
+
+
+def test_small_image_is_not_upscaled(post_with_published_location):
+    post = post_with_published_location
+    post.image = upload(size=(200, 100))
+    post.save()
+    post.refresh_from_db()
+    assert post.image_meta["renditions"]["jpeg"][0][0] == 200
+
+
+def test_replaced_image_drops_old_renditions(post_with_published_location):
+    post = post_with_published_location
+    post.image = upload()
+    post.save()
+    old = [name for _, name in post.image_meta["renditions"]["jpeg"]]
+    post.image = upload(name="other.jpg")
+    post.save()
+    assert not any(post.image.storage.exists(name) for name in old)
+    post.image = None
+    post.save()
+    assert Post.objects.get(pk=post.pk).image_meta == {}
+
+
+def test_feed_serves_card_sized_images(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    post.image = upload()
+    post.save()
+    soup = BeautifulSoup(user_client.get("/").content, "html.parser")
+    image = soup.find("img", class_="img-thumbnail")
+    assert "640w" in image["srcset"] and image["sizes"]
+    assert image["src"].endswith("-640w.jpg"), (
+        "В ленте должна загружаться копия размером с карточку,"
+        " а не оригинал."
+    )
+    assert soup.find("source", type="image/webp")
+
+
+def test_feed_image_has_stored_dimensions(
+        user_client, post_with_published_location, monkeypatch):
+    post = post_with_published_location
+    post.image = upload()
+    post.save()
+    post.refresh_from_db()
+    assert (post.image_meta["width"], post.image_meta["height"]) == (
+        1600, 900
+    )
+    assert post.image_meta["placeholder"].startswith("data:image/jpeg")
+
+    def no_file_access(*args, **kwargs):
+        raise AssertionError(
+            "Страница не должна открывать файлы изображений."
+        )
+
+    monkeypatch.setattr(Image, "open", no_file_access)
+    soup = BeautifulSoup(user_client.get("/").content, "html.parser")
+    image = soup.find("img", class_="img-thumbnail")
+    assert (image["width"], image["height"]) == ("1600", "900")
+    assert image["loading"] == "lazy"
+    assert "data:image/jpeg;base64," in image["style"], (
+        "Пока картинка грузится, должна показываться сохранённая заглушка."
+    )
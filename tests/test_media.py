@@ -0,0 +1,90 @@
+import pytest
+from django.utils.http import http_date
+
+pytestmark = [pytest.mark.django_db]
+
+CONTENT = bytes(range(256)) * 8
+
+
+@pytest.fixture
+def media_file(media_root):
+    path = media_root / "posts_images" / "photo.jpg"
+    path.parent.mkdir()
+    path.write_bytes(CONTENT)
+    return path
+
+
+def body(response):
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def test_media_is_served_with_validators(client, media_file):
+    response = client.get("/media/posts_images/photo.jpg")
+    assert response.status_code == 200
+    assert body(response) == CONTENT
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["Accept-Ranges"] == "bytes"
+    etag = response["ETag"]
+    assert client.get(
+        "/media/posts_images/photo.jpg", HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304
+    assert client.get(
+        "/media/posts_images/photo.jpg",
+        HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    ).status_code == 304, (
+        "Неизменившийся файл должен отдаваться ответом 304."
+    )
+    assert client.get("/media/../settings.py").status_code == 404
+    assert client.get("/media/posts_images/").status_code == 404
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=2040-", (2040, 2047)),
+    ("bytes=-8", (2040, 2047)),
+    ("bytes=2000-9999", (2000, 2047)),
+])
+def test_range_requests(client, media_file, header, expected):
+    response = client.get("/media/posts_images/photo.jpg", HTTP_RANGE=header)
+    start, end = expected
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes {start}-{end}/2048"
+    assert body(response) == CONTENT[start:end + 1]
+
+
+def test_unsatisfiable_and_stale_ranges(client, media_file):
+    response = client.get(
+        "/media/posts_images/photo.jpg", HTTP_RANGE="bytes=4096-"
+    )
+    assert response.status_code == 416
+    assert response["Content-Range"] == "bytes */2048"
+    response = client.get(
+        "/media/posts_images/photo.jpg", HTTP_RANGE="bytes=10-5"
+    )
+    assert response.status_code == 200, (
+        "Неверный диапазон игнорируется: файл отдаётся целиком."
+    )
+    assert body(response) == CONTENT
+    response = client.get(
+        "/media/posts_images/photo.jpg",
+        HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=http_date(0)
+    )
+    assert response.status_code == 200, (
+        "Если файл изменился после If-Range, он отдаётся целиком."
+    )
+
+
+@pytest.mark.parametrize("header, value", [
+    ("X-Sendfile", "{path}"),
+    ("X-Accel-Redirect", "/protected-media/posts_images/photo.jpg"),
+])
+def test_sendfile_offload(client, media_file, settings, header, value):
+    settings.MEDIA_SENDFILE_HEADER = header
+    response = client.get("/media/posts_images/photo.jpg")
+    assert response.status_code == 200
+    assert response[header] == value.format(path=media_file)
+    assert not response.content, (
+        "При отдаче через прокси байты файла не должны идти через Django."
+    )
@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from blog import caching
+from blog.caching import PAGES_MARKER, get_versions
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_page_is_cached(client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    first = client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        second = client.get(url)
+    assert second.content == first.content
+    assert not queries, (
+        "Убедитесь, что страница для анонимного посетителя берётся из кеша."
+    )
+    assert "Cookie" in second["Vary"]
+
+
+def test_page_cache_invalidated_by_comment(
+        client, mixer, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    client.get(url)
+    comment = mixer.blend(
+        "blog.Comment",
+        post=post_with_published_location,
+        text="Свежий комментарий",
+    )
+    assert comment.text in client.get(url).content.decode(), (
+        "Убедитесь, что новый комментарий сразу виден анонимному посетителю."
+    )
+
+
+def test_authenticated_page_is_not_cached(
+        user_client, post_with_published_location):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get("/")
+    assert queries
+
+
+def test_login_keeps_page_cache(
+        client, another_user, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    client.get(url)
+    another_user.set_password("password")
+    another_user.save()
+    assert client.login(
+        username=another_user.username, password="password"
+    )
+    client.logout()
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    assert not queries, (
+        "Вход пользователя сохраняет только last_login и не должен "
+        "сбрасывать кеш страниц."
+    )
+
+
+def test_username_change_drops_page_cache(
+        client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    client.get(url)
+    author = post_with_published_location.author
+    author.username = "renamed_author"
+    author.save()
+    assert "renamed_author" in client.get(url).content.decode(), (
+        "Новое имя автора должно сразу появиться на странице."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_pages_version_moves_after_commit(
+        mixer, post_with_published_location):
+    before = get_versions([PAGES_MARKER])
+    with transaction.atomic():
+        mixer.blend("blog.Comment", post=post_with_published_location)
+        assert get_versions([PAGES_MARKER]) == before, (
+            "До фиксации транзакции другие запросы видят старые строки: "
+            "версия страниц должна сдвигаться только после неё."
+        )
+    assert get_versions([PAGES_MARKER]) != before
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_touches_pages_after_count_update(
+        monkeypatch, mixer, post_with_published_location):
+    counts = []
+    monkeypatch.setattr(caching, "touch", lambda *markers: counts.append(
+        Post.objects.get(pk=post_with_published_location.pk).comment_count
+    ))
+    mixer.blend(
+        "blog.Comment", post=post_with_published_location,
+        author=post_with_published_location.author,
+    )
+    assert counts == [1], (
+        "Кеш страниц должен сбрасываться после того, как счётчик "
+        "комментариев уже записан."
+    )
@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.caching import INDEX_FEED
+from blog.models import Post
+from blog.pagination import CachedCountPaginator
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    now = timezone.now()
+    same_moment = now - timedelta(days=1)
+    pub_dates = (
+        same_moment if i % 3 == 0 else now - timedelta(hours=i + 1)
+        for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_dates,
+    )
+
+
+def test_cursor_pages_cover_feed_once(client, feed_posts):
+    seen = []
+    cursor = ""
+    pages = 0
+    while True:
+        response = client.get("/", {"cursor": cursor})
+        assert response.status_code == 200
+        page = response.context["page_obj"]
+        seen.extend(post.id for post in page)
+        pages += 1
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == len(feed_posts), (
+        "Убедитесь, что курсорная пагинация выдаёт каждую публикацию ровно"
+        " один раз."
+    )
+
+
+def test_cursor_previous_returns_same_page(client, feed_posts):
+    first = client.get("/", {"cursor": ""}).context["page_obj"]
+    second = client.get("/", {"cursor": first.next_cursor}).context[
+        "page_obj"
+    ]
+    back = client.get("/", {"cursor": second.previous_cursor}).context[
+        "page_obj"
+    ]
+    assert [post.id for post in back] == [post.id for post in first]
+    assert not back.has_previous()
+
+
+def test_invalid_cursor_is_404(client, feed_posts):
+    response = client.get("/", {"cursor": "garbage"})
+    assert response.status_code == 404
+
+
+def test_feed_count_is_cached_and_invalidated(
+        user_client, feed_posts, mixer: Mixer):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        page = user_client.get("/").context["page_obj"]
+    assert not any("COUNT(" in query["sql"] for query in queries), (
+        "Убедитесь, что количество публикаций в ленте берётся из кеша."
+    )
+    assert page.paginator.count == len(feed_posts)
+
+    mixer.blend(
+        "blog.Post",
+        author=feed_posts[0].author,
+        category=feed_posts[0].category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(minutes=1),
+    )
+    page = user_client.get("/").context["page_obj"]
+    assert page.paginator.count == len(feed_posts) + 1, (
+        "Убедитесь, что кеш количества публикаций сбрасывается при"
+        " создании публикации."
+    )
+
+
+def test_page_range_is_elided(client, mixer: Mixer, user, published_category):
+    mixer.cycle(N_PER_PAGE * 20).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    response = client.get("/", {"page": 10})
+    page_links = response.content.decode().count('class="page-item')
+    assert page_links < 20
+    assert "…" in response.content.decode()
+
+
+@pytest.mark.parametrize("orphans", [0, 3])
+def test_page_from_prefetched_rows_matches_page(feed_posts, orphans):
+    def paginator():
+        return CachedCountPaginator(
+            Post.objects.order_by("pk"), N_PER_PAGE, orphans=orphans,
+            feed_label="test", feeds=[INDEX_FEED],
+        )
+
+    for number in paginator().page_range:
+        expected = paginator().page(number)
+        prefetched = paginator()
+        page = prefetched.page(
+            number, rows=list(prefetched.page_rows(number))
+        )
+        assert list(page) == list(expected), (
+            "Страница из заранее прочитанных строк должна совпадать с "
+            "обычной страницей пагинатора."
+        )
+        assert page.elided_page_range == expected.elided_page_range
@@ -0,0 +1,32 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_is_served_from_cache(
+        user_client, post_with_published_location):
+    first = user_client.get("/").content.decode()
+    with CaptureQueriesContext(connection) as queries:
+        second = user_client.get("/").content.decode()
+    assert first == second
+    assert not any(
+        "blog_location" in query["sql"]
+        for query in queries
+    ), "Убедитесь, что карточки публикаций берутся из кеша."
+
+
+def test_post_card_invalidated_by_related_edit(
+        user_client, post_with_published_location):
+    location = post_with_published_location.location
+    user_client.get("/")
+    location.name = "Новое место для карточки"
+    location.save()
+    assert location.name in user_client.get("/").content.decode(), (
+        "Убедитесь, что изменение местоположения сбрасывает кеш карточек."
+    )
+
+    post_with_published_location.title = "Новый заголовок карточки"
+    post_with_published_location.save()
+    assert "Новый заголовок карточки" in user_client.get("/").content.decode()
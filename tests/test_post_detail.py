@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def post_queries(queries):
+    return [
+        query for query in queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "blog_post"' in query["sql"]
+    ]
+
+
+def test_detail_loads_post_once(user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert len(post_queries(queries)) == 1, (
+        "Убедитесь, что страница публикации загружает её одним запросом."
+    )
+
+
+def test_author_sees_own_unpublished_post(
+        user_client, another_user_client, post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    url = f"/posts/{post.id}/"
+    assert user_client.get(url).status_code == 200
+    assert another_user_client.get(url).status_code == 404
+
+
+def test_comments_are_paginated_with_authors(
+        user_client, mixer, post_with_published_location):
+    from blog.constants import COMMENTS_PAGINATE_BY
+
+    post = post_with_published_location
+    mixer.cycle(COMMENTS_PAGINATE_BY + 5).blend("blog.Comment", post=post)
+    url = f"/posts/{post.id}/"
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert len(response.context["comments"]) == COMMENTS_PAGINATE_BY
+    user_lookups = [
+        query for query in queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "auth_user"' in query["sql"]
+    ]
+    assert len(user_lookups) <= 1, (
+        "Авторы комментариев должны загружаться вместе с комментариями."
+    )
+    assert not any("COUNT(" in query["sql"] for query in queries)
+
+    last_page = user_client.get(url, {"comments_page": 2})
+    assert len(last_page.context["comments"]) == 5
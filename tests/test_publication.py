@@ -0,0 +1,72 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_feed_query_is_stable_between_requests(
+        user_client, post_with_published_location):
+    first = str(Post.objects_tailored.all().query)
+    second = str(Post.objects_tailored.all().query)
+    assert first == second, (
+        "Условие видимости не должно меняться от запроса к запросу."
+    )
+
+
+def test_scheduled_post_appears_at_its_pub_date(
+        user_client, monkeypatch, mixer, post_with_published_location):
+    now = timezone.now()
+    scheduled = mixer.blend(
+        "blog.Post",
+        author=post_with_published_location.author,
+        category=post_with_published_location.category,
+        is_published=True,
+        pub_date=now + timedelta(hours=1),
+    )
+    page = user_client.get("/").context["page_obj"]
+    assert scheduled not in page.object_list
+    assert page.paginator.count == 1
+
+    monkeypatch.setattr(
+        timezone, "now", lambda: now + timedelta(hours=1, seconds=1)
+    )
+    page = user_client.get("/").context["page_obj"]
+    assert scheduled in page.object_list, (
+        "Отложенная публикация должна появиться в ленте в момент pub_date."
+    )
+    assert page.paginator.count == 2
+
+
+def test_scheduler_refuses_process_local_cache(settings):
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}
+    with pytest.raises(CommandError, match="CACHES"):
+        call_command("publication_scheduler", once=True)
+
+
+def test_scheduler_picks_up_posts_written_without_signals(
+        client, mixer, post_with_published_location):
+    assert client.get("/").status_code == 200
+    backdated = mixer.blend(
+        "blog.Post",
+        author=post_with_published_location.author,
+        category=post_with_published_location.category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    # Дата сдвигается в прошлое в обход сигналов, как при массовой записи.
+    Post.objects.filter(pk=backdated.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    call_command("publication_scheduler", once=True, stdout=StringIO())
+    assert backdated.title in client.get("/").content.decode(), (
+        "Планировщик должен учитывать публикации, записанные без сигналов."
+    )
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from blog.views import PostListView
+from conftest import N_PER_PAGE
+from core.middleware import QueryBudgetExceeded, fingerprint
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_fingerprint_ignores_literals():
+    assert fingerprint(
+        'SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21'
+    ) == fingerprint('SELECT * FROM "t" WHERE "id" IN (%s) LIMIT 3')
+
+
+def test_over_budget_view_raises(
+        user_client, monkeypatch, post_with_published_location):
+    monkeypatch.setattr(PostListView, "query_budget", 1)
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get("/")
+
+
+def test_n_plus_one_is_detected(
+        user_client, monkeypatch, mixer, published_category):
+    mixer.cycle(N_PER_PAGE).blend(
+        "blog.Post",
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    monkeypatch.setattr(
+        PostListView, "get_queryset",
+        lambda view: Post.objects_tailored.all()
+    )
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+        user_client.get("/")
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+from blog.pagination import KEYSET_ORDERING
+
+pytestmark = [pytest.mark.django_db]
+
+
+def explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def assert_uses_index(plan, index_name):
+    assert any(index_name in step for step in plan), (
+        f"Ожидалось использование индекса `{index_name}`, план: {plan}"
+    )
+    assert not any(
+        step.startswith("SCAN") and "blog_post" in step and "INDEX" not in step
+        for step in plan
+    ), f"Полный просмотр таблицы публикаций: {plan}"
+    assert not any("TEMP B-TREE" in step for step in plan), (
+        f"Сортировка во временном B-дереве: {plan}"
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="план запроса SQLite"
+)
+@pytest.mark.parametrize(
+    ("queryset", "index_name"),
+    [
+        (lambda: Post.objects_tailored.all()[:10],
+         "post_published_feed_idx"),
+        (lambda: Post.objects_tailored.order_by(*KEYSET_ORDERING)[:11],
+         "post_published_feed_idx"),
+        (lambda: Post.objects_tailored.filter(category_id=1)[:10],
+         "post_category_feed_idx"),
+        (lambda: Post.objects.filter(author_id=1).order_by("-pub_date")[:10],
+         "post_author_feed_idx"),
+        (lambda: Post.objects_tailored.filter(author_id=1)[:10],
+         "post_author_feed_idx"),
+        (lambda: Comment.objects.filter(post_id=1),
+         "comment_post_created_idx"),
+    ],
+    ids=["index", "index keyset", "category", "profile own",
+         "profile", "comments"],
+)
+def test_feed_query_uses_index(queryset, index_name):
+    assert_uses_index(explain(queryset()), index_name)
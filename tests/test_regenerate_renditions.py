@@ -0,0 +1,44 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def image_file():
+    buffer = BytesIO()
+    Image.new("RGB", (700, 350), "green").save(buffer, "JPEG")
+    return ContentFile(buffer.getvalue(), name="old.jpg")
+
+
+def test_regenerate_renditions_resumes_from_checkpoint(
+        mixer, tmp_path, media_root):
+    posts = mixer.cycle(3).blend("blog.Post", image=image_file)
+    stale = {"source": "stale.jpg"}
+    Post.objects.update(image_meta=stale)
+    checkpoint = tmp_path / "checkpoint"
+    checkpoint.write_text(str(posts[0].pk))
+
+    output = StringIO()
+    call_command(
+        "regenerate_renditions", workers=2, batch_size=1,
+        checkpoint=checkpoint, stdout=output
+    )
+    assert "в секунду" in output.getvalue()
+
+    metas = dict(Post.objects.values_list("pk", "image_meta"))
+    assert metas[posts[0].pk] == stale, (
+        "Публикации до контрольной точки не должны обрабатываться повторно."
+    )
+    for post in posts[1:]:
+        meta = metas[post.pk]
+        assert meta["source"] == post.image.name
+        assert [width for width, _ in meta["renditions"]["jpeg"]] == [
+            320, 640, 700
+        ]
+    assert not checkpoint.exists()
@@ -0,0 +1,32 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_category_page_resolves_from_registry(
+        user_client, post_with_published_location):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert not any(
+        'FROM "blog_category"' in query["sql"]
+        or 'FROM "blog_location"' in query["sql"]
+        for query in queries
+    ), "Категории и местоположения должны браться из реестра в памяти."
+
+
+def test_registry_follows_category_changes(
+        user_client, post_with_published_location):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    assert user_client.get(url).status_code == 200
+    category.is_published = False
+    category.save()
+    assert user_client.get(url).status_code == 404, (
+        "Убедитесь, что снятая с публикации категория сразу отдаёт 404."
+    )
@@ -0,0 +1,97 @@
+import threading
+import time
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template import Context, Template
+from PIL import Image
+
+from blog import resize
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def source(media_root):
+    buffer = BytesIO()
+    Image.new("RGB", (800, 400), "blue").save(buffer, "JPEG")
+    name = default_storage.save("posts_images/wide.jpg", ContentFile(
+        buffer.getvalue()
+    ))
+    return default_storage.open(name)
+
+
+@pytest.fixture
+def resize_cache(settings, tmp_path):
+    settings.RESIZE_CACHE_ROOT = tmp_path / "resized"
+    return settings.RESIZE_CACHE_ROOT
+
+
+def url_for(image, width, height):
+    return Template(
+        "{% load blog_images %}{% resized image width height %}"
+    ).render(Context({"image": image, "width": width, "height": height}))
+
+
+def test_signed_resize_url(client, source, resize_cache):
+    url = url_for(source, 200, 200)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/jpeg"
+    assert "max-age=31536000" in response["Cache-Control"]
+    with Image.open(BytesIO(b"".join(response.streaming_content))) as image:
+        assert image.size == (200, 100), (
+            "Копия должна вписываться в запрошенный размер с сохранением"
+            " пропорций."
+        )
+    assert len(list(resize_cache.iterdir())) == 1
+    assert client.get(url.replace("200x200", "300x300")).status_code == 404, (
+        "Размер без подписи не должен обрабатываться."
+    )
+
+
+def test_concurrent_requests_are_coalesced(
+        source, resize_cache, monkeypatch):
+    calls = []
+    original = resize._resize
+
+    def slow_resize(*args):
+        calls.append(args)
+        time.sleep(0.1)
+        original(*args)
+
+    monkeypatch.setattr(resize, "_resize", slow_resize)
+    path = default_storage.path(source.name)
+    threads = [
+        threading.Thread(target=resize.cached_variant, args=(path, 64, 64))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1, (
+        "Одновременные запросы одной копии должны обрабатываться один раз."
+    )
+
+
+def test_least_recently_used_variants_are_evicted(
+        source, resize_cache, settings):
+    path = default_storage.path(source.name)
+    first = resize.cached_variant(path, 300, 300)
+    settings.RESIZE_CACHE_MAX_BYTES = 3 * resize_cache.joinpath(
+        first
+    ).stat().st_size
+    time.sleep(0.01)
+    second = resize.cached_variant(path, 310, 310)
+    time.sleep(0.01)
+    resize.cached_variant(path, 300, 300)
+    time.sleep(0.01)
+    resize.cached_variant(path, 320, 320)
+    remaining = {entry.name for entry in resize_cache.iterdir()}
+    assert first.rsplit("/", 1)[1] in remaining
+    assert second.rsplit("/", 1)[1] not in remaining, (
+        "Из кеша должны вытесняться давно не запрошенные копии."
+    )
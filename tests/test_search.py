@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.search import FTS_TABLE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable(mixer, post_with_published_location):
+    def make(title, text="", **kwargs):
+        defaults = dict(
+            author=post_with_published_location.author,
+            category=post_with_published_location.category,
+            is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+        )
+        defaults.update(kwargs)
+        return mixer.blend("blog.Post", title=title, text=text, **defaults)
+
+    return make
+
+
+def found(client, query, cursor=None):
+    params = {"q": query}
+    if cursor:
+        params["cursor"] = cursor
+    response = client.get("/search/", params)
+    assert response.status_code == 200
+    return response.context["page_obj"]
+
+
+def test_search_ranks_matches_and_hides_invisible(user_client, searchable):
+    weak = searchable("Заметки", "между делом упомянем Эльбрус")
+    strong = searchable("Эльбрус", "Эльбрус, Эльбрус и снова Эльбрус")
+    hidden = searchable("Эльбрус", "черновик", is_published=False)
+    future = searchable(
+        "Эльбрус", "скоро", pub_date=timezone.now() + timedelta(days=1)
+    )
+    page = found(user_client, "эльбрус")
+    assert list(page) == [strong, weak], (
+        "Поиск должен находить публикации без учёта регистра, ставить"
+        " лучшие совпадения выше и скрывать невидимые публикации."
+    )
+    assert hidden not in page and future not in page
+
+
+def test_search_index_follows_save_and_delete(user_client, searchable):
+    post = searchable("Байкал", "озеро")
+    assert list(found(user_client, "байкал")) == [post]
+    post.title = "Ладога"
+    post.save()
+    assert not list(found(user_client, "байкал")), (
+        "Индекс поиска должен обновляться при изменении публикации."
+    )
+    assert list(found(user_client, "ладога")) == [post]
+    post.delete()
+    assert not list(found(user_client, "ладога")), (
+        "Удалённая публикация должна пропадать из индекса поиска."
+    )
+
+
+def test_search_is_keyset_paginated(user_client, searchable):
+    posts = {searchable(f"Поход {number}", "горы") for number in range(12)}
+    first = found(user_client, "горы")
+    assert len(first) == 10 and first.has_next()
+    second = found(user_client, "горы", first.next_cursor)
+    assert not second.has_next()
+    assert set(first) | set(second) == posts, (
+        "Страницы поиска должны покрывать все результаты без повторов."
+    )
+
+
+def test_search_query_syntax_is_escaped(user_client, searchable):
+    post = searchable("Кавычки", "текст")
+    for query in ['"', "(", "*", "-", ""]:
+        assert not list(found(user_client, query))
+    for query in ['"кавычки', "кавычки*", "(кавычки) -текст:"]:
+        assert post in found(user_client, query), (
+            "Синтаксис FTS5 в запросе должен восприниматься как слова."
+        )
+
+
+def test_rebuild_search_index(user_client, searchable):
+    post = searchable("Алтай", "горы")
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    assert not list(found(user_client, "алтай"))
+    call_command("rebuild_search_index", batch_size=1, verbosity=0)
+    assert list(found(user_client, "алтай")) == [post], (
+        "Команда rebuild_search_index должна заново заполнить индекс."
+    )
@@ -0,0 +1,63 @@
+import gzip
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.template import Context, Template
+
+pytestmark = [pytest.mark.django_db]
+
+STATIC_DEV = __import__("pathlib").Path(__file__).resolve().parents[1] / (
+    "blogicum/static_dev"
+)
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path / "static"
+    call_command("collectstatic", interactive=False, stdout=StringIO())
+    manifest = json.loads(
+        (settings.STATIC_ROOT / "staticfiles.json").read_text()
+    )
+    return settings.STATIC_ROOT, manifest["paths"]
+
+
+def test_collectstatic_hashes_compresses_and_optimizes(collected):
+    root, paths = collected
+    css = root / paths["css/bootstrap.min.css"]
+    assert css.name != "bootstrap.min.css"
+    assert gzip.decompress(
+        css.with_name(css.name + ".gz").read_bytes()
+    ) == css.read_bytes(), "Рядом со статикой должна лежать её gzip-копия."
+    for name in ("img/logo.png", "img/fav/favicon-32x32.png"):
+        assert (root / paths[name]).stat().st_size <= (
+            STATIC_DEV / name
+        ).stat().st_size, "PNG после сборки не должны становиться больше."
+
+
+def test_hashed_static_is_immutable_and_precompressed(client, collected):
+    root, paths = collected
+    url = Template(
+        "{% load static %}{% static 'css/bootstrap.min.css' %}"
+    ).render(Context())
+    assert url == "/static/" + paths["css/bootstrap.min.css"]
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"].startswith("text/css")
+    assert "immutable" in response["Cache-Control"]
+    assert "max-age=31536000" in response["Cache-Control"]
+    assert "Accept-Encoding" in response["Vary"]
+    plain = client.get(url, HTTP_ACCEPT_ENCODING="gzip;q=0")
+    assert not plain.has_header("Content-Encoding"), (
+        "Клиенту без поддержки сжатия статика отдаётся как есть."
+    )
+
+
+def test_static_tag_works_without_collectstatic(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path / "empty"
+    url = Template(
+        "{% load static %}{% static 'css/bootstrap.min.css' %}"
+    ).render(Context())
+    assert url == "/static/css/bootstrap.min.css"